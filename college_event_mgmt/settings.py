@@ -41,6 +41,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first, so its timings cover every other middleware; removes itself unless REQUEST_TIMING
+    'core.timing.RequestTimingMiddleware',
+    # development/test only; removes itself unless NPLUSONE_DETECT
+    'core.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,7 +58,8 @@ ROOT_URLCONF = 'college_event_mgmt.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that reports render time to core.timing
+        'BACKEND': 'core.timing.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -84,6 +89,77 @@ DATABASES = {
 }
 
 
+# Cache
+# File-based so cached listings and their invalidation (core.listings) are
+# shared by every worker process on the host.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.django_cache',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+# Seconds a cached event listing may live (it is invalidated on change anyway)
+LISTING_CACHE_TIMEOUT = 300
+
+
+# Queue hot write views on an in-process lock (core.db); enabled in production
+SERIALIZE_WRITES = False
+
+# Seconds a seat picked on the seat map stays reserved for the picker (core.holds)
+SEAT_HOLD_TTL = 120
+
+# Waiting-room events (core.admission): students let through to registration per
+# second, and seconds an admitted student has to register before queueing again
+ADMISSION_RATE = 5
+ADMISSION_WINDOW = 300
+
+# Door check-in (core.checkin): scans are checked against an in-memory copy of
+# each event's tickets, reloaded every CHECKIN_REFRESH seconds. Ticket QR codes
+# are signed with QR_SIGNING_KEY if set, else SECRET_KEY
+CHECKIN_REFRESH = 60
+
+
+# Per-request instrumentation (core.timing): Server-Timing headers, and requests
+# slower than REQUEST_TIMING_SLOW_MS logged with their slowest queries
+REQUEST_TIMING = False
+REQUEST_TIMING_SLOW_MS = 500
+REQUEST_TIMING_SLOW_QUERIES = 5
+
+# N+1 query detection (core.nplusone), for development and tests: flag any
+# statement shape run more than NPLUSONE_THRESHOLD times in one request,
+# optionally appending findings to the NPLUSONE_REPORT file (JSON lines) or
+# raising NPlusOneError
+NPLUSONE_DETECT = False
+NPLUSONE_THRESHOLD = 5
+NPLUSONE_REPORT = None
+NPLUSONE_RAISE = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'slow_requests': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'slow_requests.log',
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+            'formatter': 'message',
+        },
+    },
+    'formatters': {
+        # records are already JSON lines
+        'message': {'format': '%(message)s'},
+    },
+    'loggers': {
+        'core.slow_requests': {'handlers': ['slow_requests'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -127,6 +203,16 @@ STATICFILES_DIRS = [
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Load request.user and its Profile in one joined query (core.auth). ModelBackend
+# stays listed so sessions created before the switch remain valid.
+AUTHENTICATION_BACKENDS = [
+    'core.auth.ProfileBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Also keep the profile role in the session, re-read only after the Profile changes
+PROFILE_ROLE_SESSION_CACHE = False
+
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'home'
@@ -138,3 +224,11 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Auditorium capacity used when approving auditorium booking requests
 AUDITORIUM_CAPACITY = 500
+
+# Events older than this many days are moved to the archive tables by
+# `manage.py archive_events` (core.archive)
+ARCHIVE_AFTER_DAYS = 180
+
+# Re-scan core/static/images/page_bgs/ when it changes instead of indexing it
+# once per process (see core.context_processors.page_background)
+PAGE_BG_AUTORELOAD = DEBUG
@@ -22,3 +22,31 @@ CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
+
+# SQLite tuned for several concurrent workers:
+# - WAL lets readers run alongside the single writer; NORMAL sync is safe with WAL
+# - busy_timeout makes writers wait for the lock instead of failing immediately
+# - IMMEDIATE transactions take the write lock up front, avoiding the
+#   read-then-write lock upgrade that fails with "database is locked"
+# - connections are kept open between requests
+# Check the effective values with `python manage.py sqlite_pragmas`.
+DATABASES['default'].update({
+    'CONN_MAX_AGE': 600,
+    'CONN_HEALTH_CHECKS': True,
+    'OPTIONS': {
+        'timeout': 20,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA busy_timeout=20000;'
+            'PRAGMA cache_size=-20000;'
+            'PRAGMA temp_store=MEMORY;'
+            'PRAGMA mmap_size=134217728;'
+        ),
+    },
+})
+
+# Queue hot write views (event_register) on an in-process lock, see core.db
+SERIALIZE_WRITES = True
+SERIALIZE_WRITES_TIMEOUT = 15
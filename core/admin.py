@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Profile, Event, Ticket, AuditoriumBooking
+from .models import Profile, Event, Ticket, AuditoriumBooking, ArchivedEvent, ArchivedTicket, ArchivedBooking
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
@@ -10,14 +10,14 @@ class ProfileAdmin(admin.ModelAdmin):
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('title', 'event_date', 'venue', 'department', 'total_seats', 'status')
-    list_filter = ('department', 'status', 'event_date')
+    list_display = ('title', 'event_date', 'venue', 'department', 'total_seats', 'status', 'waiting_room')
+    list_filter = ('department', 'status', 'waiting_room', 'event_date')
     search_fields = ('title', 'department', 'venue')
 
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
-    list_display = ('event', 'user', 'status', 'booked_at')
+    list_display = ('event', 'user', 'status', 'booked_at', 'checked_in_at')
     list_filter = ('status', 'event__event_date')
     search_fields = ('event__title', 'user__username')
 
@@ -28,3 +28,36 @@ class AuditoriumBookingAdmin(admin.ModelAdmin):
                     'requested_by', 'department', 'expected_audience', 'status')
     list_filter = ('status', 'department', 'event_date')
     search_fields = ('purpose', 'requested_by__username', 'department')
+
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """Archived rows are history: browsable, never edited by hand."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedEvent)
+class ArchivedEventAdmin(ReadOnlyAdmin):
+    list_display = ('title', 'event_date', 'venue', 'department', 'booked_count', 'total_seats', 'status')
+    list_filter = ('department', 'status')
+    search_fields = ('title', 'department', 'venue')
+    date_hierarchy = 'event_date'
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(ReadOnlyAdmin):
+    list_display = ('event', 'user', 'seat', 'status', 'booked_at', 'checked_in_at')
+    list_filter = ('status',)
+    search_fields = ('event__title', 'user__username')
+    list_select_related = ('event', 'user')
+
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(ReadOnlyAdmin):
+    list_display = ('purpose', 'event_date', 'requested_by', 'department', 'status')
+    list_filter = ('status', 'department')
+    search_fields = ('purpose', 'requested_by__username', 'department')
@@ -0,0 +1,110 @@
+"""Virtual waiting room in front of `event_register` for flash-crowd events.
+
+Students cannot register for an event with `waiting_room` set straight
+away. They first join its queue (`join_queue`), which hands out the next
+position together with an admission time spaced 1/ADMISSION_RATE seconds
+after the previous student's, so however many are waiting at most
+ADMISSION_RATE per second reach the seat map and the write path. A queue
+that has drained restarts from the current time, so late arrivals are let
+in at once without piling up a burst.
+
+Position and admission time travel in a signed token kept in a cookie.
+Polling the queue (`queue_status`) only checks the token's signature
+against the clock: no database or cache access. `reserve_seat` and
+`hold_seat` accept the token's holder from the admission time until
+ADMISSION_WINDOW seconds later; after that they have to queue again.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.urls import reverse
+
+from .models import AdmissionQueue
+
+SALT = 'core.admission'
+
+
+def admission_rate():
+    return max(float(getattr(settings, 'ADMISSION_RATE', 5)), 0.01)
+
+
+def admission_window():
+    return getattr(settings, 'ADMISSION_WINDOW', 300)
+
+
+def cookie_name(event_id):
+    return f'queue-{event_id}'
+
+
+def join_queue(event_id, user, now=None):
+    """Give `user` the next position in the event's queue; returns the signed token."""
+    now = time.time() if now is None else now
+    spacing = 1.0 / admission_rate()
+    claim = {'issued': F('issued') + 1, 'next_slot': Greatest(F('next_slot'), Value(now)) + spacing}
+    with transaction.atomic():
+        if not AdmissionQueue.objects.filter(event_id=event_id).update(**claim):
+            try:
+                with transaction.atomic():
+                    AdmissionQueue.objects.create(event_id=event_id, issued=1, next_slot=now + spacing)
+            except IntegrityError:
+                # another student opened the queue first
+                AdmissionQueue.objects.filter(event_id=event_id).update(**claim)
+        position, next_slot = AdmissionQueue.objects.filter(event_id=event_id).values_list('issued', 'next_slot').get()
+    return signing.dumps({'e': event_id, 'u': user.pk, 'p': position, 'a': round(next_slot - spacing, 3)},
+                         salt=SALT)
+
+
+def read_token(token, event_id, user_id=None):
+    """The token's contents if it is genuine and for this event (and user); None otherwise."""
+    if not token:
+        return None
+    try:
+        data = signing.loads(token, salt=SALT)
+    except signing.BadSignature:
+        return None
+    if data.get('e') != event_id or (user_id is not None and data.get('u') != user_id):
+        return None
+    return data
+
+
+def queue_status(data, now=None):
+    """Where a token stands: position, how many are still ahead, and whether it may register."""
+    now = time.time() if now is None else now
+    wait = data['a'] - now
+    expires_in = data['a'] + admission_window() - now
+    return {
+        'position': data['p'],
+        'ahead': max(math.ceil(wait * admission_rate()), 0),
+        'wait': max(math.ceil(wait), 0),
+        'admitted': wait <= 0 < expires_in,
+        'expired': expires_in <= 0,
+        'expires_in': max(int(expires_in), 0),
+        # seconds until the client should ask again
+        'retry': min(max(math.ceil(wait / 2), 1), 10),
+    }
+
+
+def request_token(request, event_id):
+    """The requesting user's token for the event from its cookie, or None."""
+    return read_token(request.COOKIES.get(cookie_name(event_id)), event_id, request.user.pk)
+
+
+def is_admitted(request, event_id):
+    data = request_token(request, event_id)
+    return data is not None and queue_status(data)['admitted']
+
+
+def set_cookie(response, event_id, token):
+    status = queue_status(read_token(token, event_id))
+    response.set_cookie(cookie_name(event_id), token, max_age=status['wait'] + admission_window(),
+                        path=reverse('event_detail', args=[event_id]), httponly=True, samesite='Lax',
+                        secure=getattr(settings, 'SESSION_COOKIE_SECURE', False))
+
+
+def clear_cookie(response, event_id):
+    response.delete_cookie(cookie_name(event_id), path=reverse('event_detail', args=[event_id]), samesite='Lax')
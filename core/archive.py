@@ -0,0 +1,62 @@
+"""Move past events, their tickets and auditorium bookings into archive tables.
+
+Live listing, registration and booking queries then only ever scan current
+rows. Archiving works in chunks, each in its own transaction: the chunk is
+copied into the `Archived*` tables (keeping primary keys) and deleted from
+the live tables in the same commit, so an interrupted run loses nothing
+and the next run simply continues with what is left. QR images of archived
+tickets are deleted; archived rows are read-only history.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedBooking, ArchivedEvent, ArchivedTicket, AuditoriumBooking, Event, Ticket
+from .purge import delete_bookings, delete_events, delete_files
+
+EVENT_FIELDS = ('id', 'title', 'description', 'department', 'event_date', 'start_time', 'end_time',
+                'venue', 'total_seats', 'booked_count', 'status', 'created_by_id', 'created_at')
+TICKET_FIELDS = ('id', 'event_id', 'user_id', 'seat', 'status', 'booked_at', 'checked_in_at')
+BOOKING_FIELDS = ('id', 'requested_by_id', 'department', 'purpose', 'event_date', 'start_time', 'end_time',
+                  'expected_audience', 'status', 'remarks', 'created_at', 'event_id')
+
+
+def archive_horizon(days=None):
+    """Events dated before the returned day are archived (ARCHIVE_AFTER_DAYS, default 180)."""
+    if days is None:
+        days = getattr(settings, 'ARCHIVE_AFTER_DAYS', 180)
+    return timezone.localdate() - timedelta(days=days)
+
+
+def archive_bookings(before, chunk_size=500):
+    """Archive one chunk of bookings dated before `before`; returns how many moved."""
+    with transaction.atomic():
+        rows = list(AuditoriumBooking.objects.filter(event_date__lt=before).order_by('pk')
+                    .values(*BOOKING_FIELDS)[:chunk_size])
+        if not rows:
+            return 0
+        # ignore_conflicts: a booking archived earlier under the same id is kept as is
+        ArchivedBooking.objects.bulk_create([ArchivedBooking(**r) for r in rows], ignore_conflicts=True)
+        return delete_bookings([r['id'] for r in rows])
+
+
+def archive_events(before, chunk_size=500):
+    """Archive one chunk of events dated before `before` with their tickets.
+
+    Returns ``(events, tickets)`` moved; ``(0, 0)`` once nothing is left.
+    """
+    with transaction.atomic():
+        rows = list(Event.objects.filter(event_date__lt=before).order_by('pk')
+                    .values(*EVENT_FIELDS)[:chunk_size])
+        if not rows:
+            return 0, 0
+        ids = [r['id'] for r in rows]
+        ArchivedEvent.objects.bulk_create([ArchivedEvent(**r) for r in rows], ignore_conflicts=True)
+        tickets = Ticket.objects.filter(event_id__in=ids).order_by('pk').values(*TICKET_FIELDS)
+        ArchivedTicket.objects.bulk_create((ArchivedTicket(**t) for t in tickets.iterator(chunk_size=2000)),
+                                           batch_size=2000, ignore_conflicts=True)
+        events, ticket_count, qr_files = delete_events(ids)
+    delete_files(qr_files)
+    return events, ticket_count
@@ -0,0 +1,79 @@
+"""Load each request's user together with its Profile, and resolve roles once.
+
+`ProfileBackend` makes `request.user` come back from a single joined
+``auth_user``/``core_profile`` query, so `user.profile` never costs another
+round-trip. `get_role` and `request_role` memoize the role on the user and
+request respectively; with PROFILE_ROLE_SESSION_CACHE enabled the role is
+also kept in the session and re-read only after the profile changes (see
+`core.signals`).
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+
+ROLE_SESSION_KEY = '_profile_role'
+
+
+class ProfileBackend(ModelBackend):
+    """ModelBackend that fetches the user and its Profile in one joined query."""
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+def get_role(user):
+    """Return the user's profile role, or None for anonymous users and users without a Profile."""
+    if not getattr(user, 'is_authenticated', False):
+        return None
+    try:
+        return user._profile_role
+    except AttributeError:
+        pass
+    try:
+        role = user.profile.role
+    except ObjectDoesNotExist:
+        role = None
+    user._profile_role = role
+    return role
+
+
+def _role_generation_key(user_id):
+    return f'core:profile-gen:{user_id}'
+
+
+def bump_role_generation(user_id):
+    """Invalidate session-cached roles for `user_id` (called when its Profile changes)."""
+    cache.set(_role_generation_key(user_id), time.time_ns(), None)
+
+
+def request_role(request):
+    """Return the role for `request.user`, resolving it at most once per request."""
+    try:
+        return request._profile_role
+    except AttributeError:
+        pass
+    user = getattr(request, 'user', None)
+    role = None
+    if user is not None and user.is_authenticated:
+        session = getattr(request, 'session', None)
+        if session is not None and getattr(settings, 'PROFILE_ROLE_SESSION_CACHE', False):
+            generation = cache.get(_role_generation_key(user.pk), 0)
+            cached = session.get(ROLE_SESSION_KEY)
+            if cached and cached[1:] == [user.pk, generation]:
+                role = cached[0]
+            else:
+                role = get_role(user)
+                session[ROLE_SESSION_KEY] = [role, user.pk, generation]
+        else:
+            role = get_role(user)
+    request._profile_role = role
+    return role
@@ -0,0 +1,114 @@
+"""QR check-in at the door, fast enough for a queue of scanners.
+
+The payload's signature is checked by `core.qr.verify_payload`; each
+event's BOOKED tickets and the ones already checked in are kept in a
+per-process `EventCheckin`, loaded with one indexed query and reloaded
+every CHECKIN_REFRESH seconds (so cancellations reach the door within that
+time). Only a ticket booked since the last load costs a single-row lookup.
+
+Admission itself is one conditional UPDATE that sets `Ticket.checked_in_at`
+only while it is still empty, so a ticket scanned at two doors served by
+different worker processes gets in once: the process whose UPDATE matched
+no row reports a duplicate. A second scan of a ticket this process has
+already seen is rejected from memory without touching the database.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Ticket
+from .qr import verify_payload
+
+_events = {}
+_events_lock = threading.Lock()
+
+
+class EventCheckin:
+    """Check-in state of one event in this process."""
+
+    def __init__(self, event_id):
+        self.event_id = event_id
+        self.tickets = {}  # BOOKED ticket id -> (seat, username)
+        self.scanned = {}  # ticket id -> check-in time, as far as this process knows
+        self.loaded = None  # time.monotonic() of the last load
+        self.lock = threading.Lock()
+
+    def _load(self):
+        rows = list(Ticket.objects.filter(event_id=self.event_id, status='BOOKED')
+                    .values_list('pk', 'seat', 'user__username', 'checked_in_at'))
+        self.tickets = {pk: (seat, username) for pk, seat, username, _ in rows}
+        # rebuilt, not merged: a ticket cancelled and booked again may check in anew
+        self.scanned = {pk: checked_in_at for pk, _, _, checked_in_at in rows if checked_in_at is not None}
+        self.loaded = time.monotonic()
+
+    def _lookup(self, ticket_id):
+        # a ticket booked since the last load
+        row = (Ticket.objects.filter(pk=ticket_id, event_id=self.event_id, status='BOOKED')
+               .values_list('seat', 'user__username', 'checked_in_at').first())
+        if row is None:
+            return None
+        self.tickets[ticket_id] = row[:2]
+        if row[2] is not None:
+            self.scanned[ticket_id] = row[2]
+        return row[:2]
+
+    def scan(self, ticket_id):
+        with self.lock:
+            if self.loaded is None or time.monotonic() - self.loaded > getattr(settings, 'CHECKIN_REFRESH', 60):
+                self._load()
+            info = self.tickets.get(ticket_id) or self._lookup(ticket_id)
+            if info is None:
+                return _result('not_booked', ticket_id)
+            if ticket_id in self.scanned:
+                return _result('duplicate', ticket_id, info, self.scanned[ticket_id])
+        now = timezone.now()
+        if Ticket.objects.filter(pk=ticket_id, event_id=self.event_id, status='BOOKED',
+                                 checked_in_at__isnull=True).update(checked_in_at=now):
+            with self.lock:
+                self.scanned[ticket_id] = now
+            return _result('checked_in', ticket_id, info, now)
+        # another process let the ticket in first, or it was cancelled since the last load
+        checked_in_at = (Ticket.objects.filter(pk=ticket_id, event_id=self.event_id, status='BOOKED')
+                         .values_list('checked_in_at', flat=True).first())
+        with self.lock:
+            if checked_in_at is None:
+                self.tickets.pop(ticket_id, None)
+                return _result('not_booked', ticket_id)
+            self.scanned[ticket_id] = checked_in_at
+        return _result('duplicate', ticket_id, info, checked_in_at)
+
+    def counts(self):
+        with self.lock:
+            return {'booked': len(self.tickets), 'checked_in': len(self.scanned)}
+
+
+def _result(result, ticket_id, info=None, checked_in_at=None):
+    seat, name = info or (None, None)
+    return {'ok': result == 'checked_in', 'result': result, 'ticket': ticket_id, 'seat': seat, 'name': name,
+            'checked_in_at': checked_in_at}
+
+
+def event_checkin(event_id):
+    """The check-in state of an event, created on first use."""
+    with _events_lock:
+        state = _events.get(event_id)
+        if state is None:
+            state = _events[event_id] = EventCheckin(event_id)
+        return state
+
+
+def scan(event_id, code):
+    """Check in the ticket whose QR payload is `code` at event `event_id`.
+
+    Returns a dict whose `result` is ``checked_in``, ``duplicate``,
+    ``not_booked`` (cancelled or unknown), ``wrong_event`` or ``invalid``
+    (unreadable or forged), with the ticket's seat and holder when known.
+    """
+    ids = verify_payload(code)
+    if ids is None:
+        return _result('invalid', None)
+    if ids[0] != event_id:
+        return _result('wrong_event', ids[1])
+    return event_checkin(event_id).scan(ids[1])
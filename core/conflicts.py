@@ -0,0 +1,52 @@
+"""Venue double-booking checks.
+
+Two slots on the same venue and date conflict unless one ends before (or
+exactly when) the other starts, i.e. ``start < other.end AND end > other.start``.
+The predicate runs in the database against the `event_venue_slot_idx`
+composite index, so a check costs one indexed query however many events the
+day holds.
+"""
+from django.db.models import Q
+
+from .models import Event
+
+
+def _overlap(venue, event_date, start_time, end_time):
+    return Q(venue=venue, event_date=event_date, start_time__lt=end_time, end_time__gt=start_time)
+
+
+def find_conflict(venue, event_date, start_time, end_time, statuses=None, exclude_pk=None):
+    """Return the earliest event overlapping the slot, or None.
+
+    `statuses` limits the check to events in those states (e.g. ``['OPEN']``
+    when approving); `exclude_pk` skips the event being edited.
+    """
+    qs = Event.objects.filter(_overlap(venue, event_date, start_time, end_time))
+    if statuses:
+        qs = qs.filter(status__in=statuses)
+    if exclude_pk:
+        qs = qs.exclude(pk=exclude_pk)
+    return qs.order_by('start_time', 'pk').first()
+
+
+def find_conflicts(venue, slots, statuses=None):
+    """Check many candidate `(event_date, start_time, end_time)` slots at once.
+
+    Returns a list parallel to `slots` holding the conflicting events for
+    each slot (empty when the slot is free), using a single query.
+    """
+    slots = list(slots)
+    if not slots:
+        return []
+    q = Q()
+    for event_date, start_time, end_time in slots:
+        q |= _overlap(venue, event_date, start_time, end_time)
+    qs = Event.objects.filter(q)
+    if statuses:
+        qs = qs.filter(status__in=statuses)
+    candidates = list(qs.order_by('event_date', 'start_time', 'pk'))
+    return [
+        [ev for ev in candidates
+         if ev.event_date == event_date and ev.start_time < end_time and ev.end_time > start_time]
+        for event_date, start_time, end_time in slots
+    ]
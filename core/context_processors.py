@@ -1,9 +1,12 @@
-import os
 import random
+import re
 from pathlib import Path
+from types import MappingProxyType
 from django.conf import settings
 from django.templatetags.static import static
 
+from .auth import request_role
+
 
 def user_profile_role(request):
     """Context processor that exposes `user_profile_role` safely.
@@ -11,14 +14,78 @@ def user_profile_role(request):
     Returns the profile role string when available, otherwise None. Use in
     templates as `user_profile_role` to avoid accessing `user.profile` directly.
     """
-    role = None
-    user = getattr(request, 'user', None)
-    if user and user.is_authenticated:
-        try:
-            role = user.profile.role
-        except Exception:
-            role = None
-    return {'user_profile_role': role}
+    return {'user_profile_role': request_role(request)}
+
+
+PAGE_BGS_DIR = Path(settings.BASE_DIR) / 'core' / 'static' / 'images' / 'page_bgs'
+PAGE_BG_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.svg')
+
+# explicit mapping: route -> filename (if present)
+PAGE_BG_ROUTES = {
+    '': 'home',              # root -> home.jpg
+    'events': 'events',      # /events/ -> events.jpg
+    'auditorium': 'home',    # /auditorium/ -> use home.jpg for clarity
+}
+
+# overlay opacity per image to ensure text contrast
+PAGE_BG_OVERLAYS = {
+    'home': 0.12,
+    'events': 0.14,
+    'event_detail': 0.18,
+    'booking': 0.22,
+}
+
+_EVENT_DETAIL_RE = re.compile(r'^events/\d+/?$')
+
+# (directory mtime, catalogue) built on first use; see _page_bg_catalogue()
+_page_bg_cache = None
+
+
+def _build_page_bg_catalogue(imgs_dir):
+    """Scan `imgs_dir` once into read-only lookups of (static url, overlay) pairs."""
+    # Gather image files (common extensions) but exclude booking.jpg (unclear for pages)
+    files = sorted(p.name for p in imgs_dir.iterdir()
+                   if p.suffix.lower() in PAGE_BG_EXTENSIONS and not p.name.lower().startswith('booking'))
+    entries = {}
+    prefixes = {}
+    all_entries = []
+    for name in files:
+        basename = name.rsplit('.', 1)[0].lower()
+        # resolve to static URL relative to STATICFILES_DIRS (images stored under 'images/page_bgs/')
+        entry = (static(f'images/page_bgs/{name}'), PAGE_BG_OVERLAYS.get(basename, 0.14))
+        entries.setdefault(basename, entry)
+        all_entries.append(entry)
+        # first-segment heuristic: every prefix of the file name maps to the first file having it
+        for i in range(1, len(name) + 1):
+            prefixes.setdefault(name[:i].lower(), entry)
+    by_segment = {segment: entries[name] for segment, name in PAGE_BG_ROUTES.items() if name in entries}
+    return {
+        'all': tuple(all_entries),
+        'by_segment': MappingProxyType(by_segment),
+        'by_prefix': MappingProxyType(prefixes),
+        'event_detail': entries.get('event_detail'),
+    }
+
+
+def _page_bg_catalogue():
+    """Return the background catalogue, building it on first use.
+
+    The folder only changes at deploy time, so it is scanned once per
+    process. With PAGE_BG_AUTORELOAD (defaults to DEBUG) the folder's mtime
+    is checked on each call and the catalogue rebuilt when it changes.
+    """
+    global _page_bg_cache
+    cache = _page_bg_cache
+    if cache is not None and not getattr(settings, 'PAGE_BG_AUTORELOAD', settings.DEBUG):
+        return cache[1]
+    try:
+        mtime = PAGE_BGS_DIR.stat().st_mtime
+    except OSError:
+        mtime = None
+    if cache is None or cache[0] != mtime:
+        catalogue = _build_page_bg_catalogue(PAGE_BGS_DIR) if mtime is not None and PAGE_BGS_DIR.is_dir() else None
+        cache = _page_bg_cache = (mtime, catalogue)
+    return cache[1]
 
 
 def page_background(request):
@@ -33,15 +100,12 @@ def page_background(request):
 
     The returned `page_bg_url` is a fully-resolved static URL (via `static()`).
     Templates can then set a CSS variable like `--page-bg-url` using it.
+    The folder is indexed once (see `_page_bg_catalogue`), so a request only
+    costs a few dictionary lookups.
     """
     try:
-        imgs_dir = Path(settings.BASE_DIR) / 'core' / 'static' / 'images' / 'page_bgs'
-        if not imgs_dir.exists() or not imgs_dir.is_dir():
-            return {'page_bg_url': None}
-
-        # Gather image files (common extensions) but exclude booking.jpg (unclear for pages)
-        files = [p.name for p in imgs_dir.iterdir() if p.suffix.lower() in ('.png', '.jpg', '.jpeg', '.webp', '.svg') and not p.name.lower().startswith('booking')]
-        if not files:
+        catalogue = _page_bg_catalogue()
+        if not catalogue or not catalogue['all']:
             return {'page_bg_url': None}
 
         # Prefer explicit mapping for common pages, then fall back to the
@@ -49,49 +113,29 @@ def page_background(request):
         path = (request.path or '').strip('/')
         path_segment = path.split('/')[0] if path else ''
 
-        # explicit mapping: route -> filename (if present)
-        mapping = {
-            '': 'home',              # root -> home.jpg
-            'events': 'events',      # /events/ -> events.jpg
-            'auditorium': 'home',    # /auditorium/ -> use home.jpg for clarity
-        }
-
         candidate = None
 
         # Special case: event detail pages like /events/123/ -> prefer event_detail
-        import re
-        if re.match(r'^events/\d+/?$', path):
-            if 'event_detail' in [f.rsplit('.',1)[0] for f in files]:
-                candidate = next((f for f in files if f.rsplit('.',1)[0] == 'event_detail'), None)
+        if _EVENT_DETAIL_RE.match(path):
+            candidate = catalogue['event_detail']
 
         # Try mapping (home/events/auditorium)
-        if not candidate and path_segment in mapping:
-            name = mapping[path_segment]
-            candidate = next((f for f in files if f.rsplit('.',1)[0].lower() == name.lower()), None)
+        if not candidate:
+            candidate = catalogue['by_segment'].get(path_segment)
 
         # If no mapped candidate, fall back to the first-segment heuristic
         if not candidate and path_segment:
-            candidate = next((f for f in files if f.lower().startswith(path_segment.lower())), None)
+            candidate = catalogue['by_prefix'].get(path_segment.lower())
 
         # final fallback: random available image
         if not candidate:
-            candidate = random.choice(files)
-
-        # determine overlay opacity per image to ensure text contrast
-        basename = candidate.rsplit('.', 1)[0].lower()
-        overlay_map = {
-            'home': 0.12,
-            'events': 0.14,
-            'event_detail': 0.18,
-            'booking': 0.22,
-        }
-        overlay = overlay_map.get(basename, 0.14)
+            candidate = random.choice(catalogue['all'])
 
+        url, overlay = candidate
         # force a stronger overlay for auditorium pages to improve contrast
         if path_segment and 'auditorium' in path_segment:
             overlay = max(overlay, 0.22)
 
-        # resolve to static URL relative to STATICFILES_DIRS (images stored under 'images/page_bgs/')
-        return {'page_bg_url': static(f'images/page_bgs/{candidate}'), 'page_bg_overlay': overlay}
+        return {'page_bg_url': url, 'page_bg_overlay': overlay}
     except Exception:
         return {'page_bg_url': None, 'page_bg_overlay': 0.12}
@@ -0,0 +1,34 @@
+"""SQLite write serialization for hot write views.
+
+SQLite allows one writer at a time. When many requests in the same worker
+process try to write at once they all spin in SQLite's busy handler and
+the unlucky ones fail with "database is locked". `serialize_writes` makes
+those requests queue on an in-process lock instead, so only one of them at
+a time competes with other processes for the database write lock.
+
+Enabled by SERIALIZE_WRITES (see settings_production); a request that waits
+longer than SERIALIZE_WRITES_TIMEOUT seconds gets a 503 with Retry-After.
+"""
+import threading
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+
+_write_lock = threading.Lock()
+
+
+def serialize_writes(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not getattr(settings, 'SERIALIZE_WRITES', False):
+            return view(request, *args, **kwargs)
+        if not _write_lock.acquire(timeout=getattr(settings, 'SERIALIZE_WRITES_TIMEOUT', 10)):
+            response = HttpResponse("The server is busy, please try again.", status=503, content_type='text/plain')
+            response['Retry-After'] = '2'
+            return response
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _write_lock.release()
+    return wrapper
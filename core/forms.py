@@ -2,12 +2,13 @@ from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from .models import Event, AuditoriumBooking, Profile
+from .conflicts import find_conflict
 
 class EventForm(forms.ModelForm):
     class Meta:
         model = Event
         fields = ['title', 'description', 'department', 'event_date',
-                  'start_time', 'end_time', 'venue', 'total_seats', 'status']
+                  'start_time', 'end_time', 'venue', 'total_seats', 'status', 'waiting_room']
 
     def clean(self):
         cleaned = super().clean()
@@ -18,14 +19,11 @@ class EventForm(forms.ModelForm):
 
         # prevent overlapping events at the same venue and date/time
         if event_date and start_time and end_time and venue:
-            overlapping = Event.objects.filter(event_date=event_date, venue=venue)
             # exclude self when editing (instance)
-            if self.instance and self.instance.pk:
-                overlapping = overlapping.exclude(pk=self.instance.pk)
-            for ev in overlapping:
-                # check time overlap: events conflict if NOT (end <= other.start OR start >= other.end)
-                if not (end_time <= ev.start_time or start_time >= ev.end_time):
-                    raise forms.ValidationError(f'Event times overlap with another event "{ev.title}" at {venue} on {event_date}. Please choose a different time or venue.')
+            ev = find_conflict(venue, event_date, start_time, end_time,
+                               exclude_pk=self.instance.pk if self.instance else None)
+            if ev:
+                raise forms.ValidationError(f'Event times overlap with another event "{ev.title}" at {venue} on {event_date}. Please choose a different time or venue.')
         return cleaned
 
 
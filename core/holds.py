@@ -0,0 +1,103 @@
+"""Short-lived seat holds taken from the seat map.
+
+Picking a seat on `event_detail` calls `hold_seat`, which reserves that
+seat for the user for SEAT_HOLD_TTL seconds (renewed on every pick).
+Other users' seat maps show it as held, and `reserve_seat` refuses it to
+anyone but the holder, so contention is resolved at pick time instead of
+at submit time. Registering converts the hold into a Ticket. On events
+with a waiting room only students the queue has admitted can hold seats.
+
+A lapsed hold is ignored by every read and replaced in place when someone
+else picks the seat; `sweep_expired_holds` (the `sweep_seat_holds`
+command) deletes lapsed rows in bulk in `expires_at` order, reading only
+the expired end of `seathold_expires_idx`.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import seatmap
+from .models import Event, SeatHold, Ticket
+from .registration import AlreadyRegistered, EventFull, InvalidSeat, NotAdmitted, SeatHeld, SeatTaken
+
+
+def hold_ttl():
+    return timedelta(seconds=getattr(settings, 'SEAT_HOLD_TTL', 120))
+
+
+def active_holds(event_id, now=None):
+    """Labels of the seats currently held on the event, sorted."""
+    now = now or timezone.now()
+    return list(SeatHold.objects.filter(event_id=event_id, expires_at__gt=now)
+                .order_by('seat').values_list('seat', flat=True))
+
+
+def seat_holds(event_id, user, now=None):
+    """``(held, mine)``: the sorted labels of seats other users hold on the event, and `user`'s seat or None."""
+    now = now or timezone.now()
+    held, mine = [], None
+    for seat, user_id in (SeatHold.objects.filter(event_id=event_id, expires_at__gt=now)
+                          .order_by('seat').values_list('seat', 'user_id')):
+        if user_id == user.pk:
+            mine = seat
+        else:
+            held.append(seat)
+    return held, mine
+
+
+def hold_seat(event_id, user, seat, admitted=False):
+    """Hold `seat` for `user`, replacing any other seat they hold on the event.
+
+    Returns the hold's expiry time. Raises `EventFull` if the event is not
+    OPEN, `InvalidSeat` for labels off the map, `SeatTaken` if the seat is
+    booked and `SeatHeld` if another user holds it. Waiting-room events
+    raise `NotAdmitted` unless `admitted`, and a user who already holds a
+    BOOKED ticket gets `AlreadyRegistered` instead of a hold.
+    """
+    seat = (seat or '').strip().upper()
+    now = timezone.now()
+    expires_at = now + hold_ttl()
+    row = (Event.objects.filter(pk=event_id, status='OPEN')
+           .values_list('total_seats', 'seat_bitmap', 'waiting_room').first())
+    if row is None:
+        raise EventFull()
+    total, bitmap, waiting_room = row
+    if waiting_room and not admitted:
+        raise NotAdmitted()
+    idx = seatmap.seat_index(seat, total)
+    if idx is None:
+        raise InvalidSeat()
+    if seatmap.is_set(bytes(bitmap), idx):
+        raise SeatTaken()
+    if Ticket.objects.filter(event_id=event_id, user=user, status='BOOKED').exists():
+        raise AlreadyRegistered()
+    try:
+        with transaction.atomic():
+            # renewing our own hold on the same seat is the common case
+            if SeatHold.objects.filter(event_id=event_id, seat=seat, user=user).update(expires_at=expires_at):
+                return expires_at
+            # drop our previous seat and any lapsed hold on this one, then claim it
+            SeatHold.objects.filter(event_id=event_id, user=user).delete()
+            SeatHold.objects.filter(event_id=event_id, seat=seat, expires_at__lte=now).delete()
+            SeatHold.objects.create(event_id=event_id, user=user, seat=seat, expires_at=expires_at)
+    except IntegrityError:
+        raise SeatHeld()
+    return expires_at
+
+
+def release_hold(event_id, user):
+    SeatHold.objects.filter(event_id=event_id, user=user).delete()
+
+
+def sweep_expired_holds(now=None, chunk_size=1000):
+    """Delete lapsed holds in chunks, oldest first; returns how many were removed."""
+    now = now or timezone.now()
+    removed = 0
+    while True:
+        ids = list(SeatHold.objects.filter(expires_at__lte=now).order_by('expires_at')
+                   .values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return removed
+        removed += SeatHold.objects.filter(pk__in=ids).delete()[0]
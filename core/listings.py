@@ -0,0 +1,101 @@
+"""Read-through cache for the event cards shown by `home` and `event_list`.
+
+Cards are cached as plain dicts under keys that embed a listings version.
+Any change to an Event or Ticket bumps the version (see `core.signals`),
+so stale entries are never read again and simply expire. The default cache
+is file-based, so the version and the cards are shared by every worker
+process on the host. Hits and misses are counted in the cache as well;
+`manage.py listing_cache_stats` prints them.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'core:listings:version'
+STATS_KEYS = {'hits': 'core:listings:hits', 'misses': 'core:listings:misses'}
+
+
+def listings_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_listings():
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def _count(kind):
+    key = STATS_KEYS[kind]
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def listing_stats():
+    hits, misses = (cache.get(STATS_KEYS[k], 0) for k in ('hits', 'misses'))
+    return {'hits': hits, 'misses': misses}
+
+
+def reset_listing_stats():
+    cache.delete_many(STATS_KEYS.values())
+
+
+def event_card(event):
+    """The fields an event card renders, as a picklable dict."""
+    return {
+        'pk': event.pk,
+        'title': event.title,
+        'description': event.description,
+        'department': event.department,
+        'event_date': event.event_date,
+        'start_time': event.start_time,
+        'end_time': event.end_time,
+        'venue': event.venue,
+        'total_seats': event.total_seats,
+        'available_seats': event.available_seats(),
+    }
+
+
+def _key(name, params=None):
+    key = f'core:listings:{listings_version()}:{name}'
+    if params:
+        # user-supplied values may be long or contain spaces; hash them into the key
+        key += ':' + hashlib.md5(urlencode(sorted(params.items())).encode()).hexdigest()
+    return key
+
+
+def cached_cards(name, queryset, params=None):
+    """Return event cards for `queryset`, cached under `name` until the next change.
+
+    `params` (a dict of the filters and cursor that shaped the queryset) is
+    part of the key, so every page and filter combination is cached apart.
+    """
+    key = _key(name, params)
+    cards = cache.get(key)
+    if cards is None:
+        _count('misses')
+        cards = [event_card(ev) for ev in queryset]
+        cache.set(key, cards, getattr(settings, 'LISTING_CACHE_TIMEOUT', 300))
+    else:
+        _count('hits')
+    return cards
+
+
+def cached_departments():
+    """Departments that have OPEN events, for the event_list filter."""
+    from .models import Event  # models import this module
+
+    key = _key('departments')
+    departments = cache.get(key)
+    if departments is None:
+        departments = list(Event.objects.filter(status='OPEN').exclude(department='')
+                           .order_by('department').values_list('department', flat=True).distinct())
+        cache.set(key, departments, getattr(settings, 'LISTING_CACHE_TIMEOUT', 300))
+    return departments
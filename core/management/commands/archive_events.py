@@ -0,0 +1,48 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from core.archive import archive_bookings, archive_events, archive_horizon
+from core.listings import invalidate_listings
+
+
+class Command(BaseCommand):
+    help = ("Move events older than the archive horizon, with their tickets and auditorium bookings, "
+            "into the archive tables. Runs in chunks and can be interrupted and re-run at any time.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            help='Archive events more than this many days old (default: ARCHIVE_AFTER_DAYS, 180).')
+        parser.add_argument('--before', type=date.fromisoformat,
+                            help='Archive events dated before YYYY-MM-DD (overrides --days).')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Number of events (or bookings) moved per transaction (default: 500).')
+        parser.add_argument('--limit', type=int, help='Stop after roughly this many events.')
+
+    def handle(self, *args, **options):
+        before = options['before'] or archive_horizon(options['days'])
+        chunk_size = max(options['chunk_size'], 1)
+        self.stdout.write(f"Archiving events and bookings dated before {before}")
+        started = time.monotonic()
+
+        # bookings first, while they still point at their events
+        bookings = 0
+        while moved := archive_bookings(before, chunk_size):
+            bookings += moved
+
+        events = tickets = 0
+        while not options['limit'] or events < options['limit']:
+            moved, moved_tickets = archive_events(before, chunk_size)
+            if not moved:
+                break
+            events += moved
+            tickets += moved_tickets
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"events: {events:,}, tickets: {tickets:,} ({events / elapsed if elapsed else 0:,.0f} events/s)")
+
+        if events:
+            invalidate_listings()
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {events:,} events, {tickets:,} tickets and {bookings:,} bookings "
+            f"in {time.monotonic() - started:.1f}s."))
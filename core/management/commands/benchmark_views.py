@@ -0,0 +1,207 @@
+import json
+import math
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from core import nplusone, seatmap
+from core.models import Event, Profile, Ticket, WaitlistEntry
+from core.qr import qr_payload
+from core.seeding import seed
+
+# Maximum SQL queries per request. Includes the session and user lookups.
+QUERY_BUDGETS = {
+    'home': 3,
+    'event_list': 4,  # + the department filter options on a cache miss
+    'event_search': 4,
+    'event_detail': 5,  # + the seat holds shown on the seat map
+    'my_events': 4,
+    'booking_list_admin': 4,  # + the paginator count
+    'booking_list_organizer': 4,
+    'event_register': 11,  # + the seat-hold check, hold-to-ticket conversion and waitlist cleanup
+    'ticket_cancel': 10,  # with a waitlist: the seat goes straight to its head
+    'event_checkin': 4,  # + the check-in UPDATE, and loading the event's tickets on the first scan
+    'event_queue_status': 0,  # answered from the signed queue cookie alone
+    'event_manifest': 5,  # + the version and one streamed ticket query (timed to the last byte)
+}
+
+
+def streamed(response):
+    # a streaming view only runs its queries while the body is read
+    response.getvalue()
+    return response
+
+
+class Command(BaseCommand):
+    help = ("Seed a throwaway test database and time the main views with the test client, "
+            "reporting p50/p95 latency and SQL query counts. Fails when a view exceeds its "
+            "query budget, repeats a query shape (N+1) or regresses past a stored baseline.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--events', type=int, default=500)
+        parser.add_argument('--fill', type=float, default=0.5, help='Average fraction of seats booked.')
+        parser.add_argument('--bookings', type=int, default=1000)
+        parser.add_argument('--iterations', type=int, default=30, help='Requests timed per view.')
+        parser.add_argument('--seed', type=int, default=1234)
+        parser.add_argument('--cold', action='store_true',
+                            help='Disable the cache so every request hits the database.')
+        parser.add_argument('--baseline', help='JSON file of earlier results to compare against.')
+        parser.add_argument('--tolerance', type=float, default=1.5,
+                            help='Allowed p95 slowdown factor against the baseline (default: 1.5).')
+        parser.add_argument('--save-baseline', help='Write these results to a JSON file.')
+
+    def handle(self, *args, **options):
+        with self.test_environment(options):
+            results = self._run(options)
+
+        failures = self._report(results, options)
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline written to {options['save_baseline']}")
+        if failures:
+            raise CommandError("Benchmark failed:\n  " + "\n  ".join(failures))
+
+    @contextmanager
+    def test_environment(self, options):
+        """Run the body against a throwaway test database, cache and MEDIA_ROOT."""
+        cache_backend = ('django.core.cache.backends.dummy.DummyCache' if options['cold']
+                         else 'django.core.cache.backends.locmem.LocMemCache')
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(
+                    CACHES={'default': {'BACKEND': cache_backend}},
+                    MEDIA_ROOT=media_root, SERIALIZE_WRITES=False):
+                yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def build_cases(self, options):
+        """Seed the database; return {view name: callable(i) making the i-th request} and the registration target event."""
+        started = time.monotonic()
+        data = seed(users=options['users'], events=options['events'], fill=options['fill'],
+                    bookings=options['bookings'], seed=options['seed'])
+        self.stdout.write(f"Seeded {data['users']} users, {data['events']} events, "
+                          f"{data['tickets']} tickets, {data['bookings']} bookings "
+                          f"in {time.monotonic() - started:.1f}s")
+
+        student = User.objects.get(pk=data['first_user_id'])
+        manager = User.objects.create_user('bench_manager', is_staff=True)
+        Profile.objects.create(user=manager, role='auditorium_manager')
+        # a roomy OPEN event that the registration benchmark can fill
+        target = Event.objects.create(title='Benchmark registration target', description='-',
+                                      event_date=date.today(), start_time='08:00',
+                                      end_time='09:00', venue='Benchmark Hall', total_seats=options['iterations'] * 2)
+        detail = Event.objects.filter(status='OPEN').exclude(pk=target.pk).order_by('-booked_count').first()
+        # a full event with as many users waiting as there are registrants, so every cancellation promotes one
+        waitlisted = Event.objects.create(title='Benchmark waitlist', description='-', event_date=date.today(),
+                                          start_time='12:00', end_time='13:00', venue='Benchmark Hall',
+                                          total_seats=options['iterations'], status='CLOSED')
+        registrants, cancellations = [], []
+        for i in range(options['iterations']):
+            client, user = Client(), User.objects.create_user(f'bench_registrant_{i}')
+            client.force_login(user)
+            registrants.append(client)
+            cancellations.append(Ticket.objects.create(event=waitlisted, user=user).pk)
+        Event.objects.filter(pk=waitlisted.pk).update(booked_count=options['iterations'], sold_out=True)
+        WaitlistEntry.objects.bulk_create(
+            WaitlistEntry(event=waitlisted, user=User.objects.create_user(f'bench_waiting_{i}'))
+            for i in range(options['iterations']))
+
+        student_client, manager_client = Client(), Client()
+        student_client.force_login(student)
+        manager_client.force_login(manager)
+        register_url = reverse('event_register', args=[target.pk])
+        # tickets scanned at the door of the detail event, each once
+        codes = [qr_payload(t) for t in Ticket.objects.filter(event=detail, status='BOOKED')[:options['iterations']]]
+        # a waiting-room event the student has queued for
+        queued = Event.objects.create(title='Benchmark waiting room', description='-', event_date=date.today(),
+                                      start_time='10:00', end_time='11:00', venue='Benchmark Hall',
+                                      total_seats=10, waiting_room=True)
+        student_client.post(reverse('event_queue', args=[queued.pk]))
+
+        # view name -> callable(i) performing the i-th timed request
+        cases = {
+            'home': lambda i: student_client.get(reverse('home')),
+            'event_list': lambda i: student_client.get(reverse('event_list')),
+            'event_search': lambda i: student_client.get(reverse('event_search'), {'q': 'machine learn'}),
+            'event_detail': lambda i: student_client.get(reverse('event_detail', args=[detail.pk])),
+            'my_events': lambda i: student_client.get(reverse('my_events')),
+            'booking_list_admin': lambda i: manager_client.get(reverse('booking_list_admin')),
+            'booking_list_organizer': lambda i: manager_client.get(reverse('booking_list_organizer')),
+            'event_register': lambda i: registrants[i].post(
+                register_url, {'seat': seatmap.seat_label(i, target.total_seats)}),
+            'event_queue_status': lambda i: student_client.get(reverse('event_queue_status', args=[queued.pk])),
+            'ticket_cancel': lambda i: registrants[i].post(reverse('ticket_cancel', args=[cancellations[i]])),
+            'event_checkin': lambda i: manager_client.post(reverse('event_checkin', args=[detail.pk]),
+                                                           {'code': codes[i % len(codes)]}),
+            'event_manifest': lambda i: streamed(manager_client.get(reverse('event_manifest', args=[detail.pk]))),
+        }
+        return cases, target
+
+    def _run(self, options):
+        cases, target = self.build_cases(options)
+        results = {}
+        self.repeated_queries = {}
+        for name, case in cases.items():
+            timings, queries = [], []
+            for i in range(options['iterations']):
+                connection.queries_log.clear()  # the log is capped at 9000 entries
+                with CaptureQueriesContext(connection) as ctx, nplusone.detect() as shapes:
+                    t0 = time.perf_counter()
+                    response = case(i)
+                    timings.append((time.perf_counter() - t0) * 1000)
+                if response.status_code >= 400:
+                    raise CommandError(f"{name} returned HTTP {response.status_code}")
+                queries.append(len(ctx.captured_queries))
+                if i == 0:
+                    self.repeated_queries[name] = shapes.repeated(getattr(settings, 'NPLUSONE_THRESHOLD', 5))
+            timings.sort()
+            results[name] = {
+                'p50_ms': round(statistics.median(timings), 2),
+                'p95_ms': round(timings[max(math.ceil(0.95 * len(timings)) - 1, 0)], 2),
+                'queries': max(queries),
+            }
+        if Ticket.objects.filter(event=target).count() != options['iterations']:
+            raise CommandError("event_register did not create one ticket per request")
+        if WaitlistEntry.objects.exists():
+            raise CommandError("ticket_cancel did not promote one waiting user per request")
+        return results
+
+    def _report(self, results, options):
+        baseline = {}
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        failures = []
+        self.stdout.write(f"\n{'view':<24}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'budget':>8}")
+        for name, r in results.items():
+            budget = QUERY_BUDGETS.get(name)
+            self.stdout.write(f"{name:<24}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['queries']:>9}"
+                              f"{budget if budget is not None else '-':>8}")
+            if budget is not None and r['queries'] > budget:
+                failures.append(f"{name}: {r['queries']} queries exceeds budget of {budget}")
+            if self.repeated_queries.get(name):
+                failures.append(f"{name}: N+1 queries: {nplusone.describe(self.repeated_queries[name])}")
+            base = baseline.get(name)
+            if base:
+                if r['queries'] > base['queries']:
+                    failures.append(f"{name}: {r['queries']} queries, baseline {base['queries']}")
+                if r['p95_ms'] > base['p95_ms'] * options['tolerance']:
+                    failures.append(f"{name}: p95 {r['p95_ms']}ms, baseline {base['p95_ms']}ms "
+                                    f"(tolerance x{options['tolerance']})")
+        return failures
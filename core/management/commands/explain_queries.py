@@ -0,0 +1,59 @@
+import re
+
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .benchmark_views import Command as BenchmarkCommand
+
+# SQLite reports indexed lookups as "SEARCH <table> ..." and reads of a whole
+# table as "SCAN <table>", optionally walking an index ("USING [COVERING] INDEX"),
+# which still visits every row.
+FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX \w+)?$')
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE')
+
+# Full scans that are expected, by view: {view name: {table, ...}}.
+ALLOWED_SCANS = {}
+
+
+class Command(BenchmarkCommand):
+    help = ("Seed a throwaway test database, request each benchmarked view once and run EXPLAIN QUERY PLAN "
+            "on every query it makes. Fails if a query does a full table scan.")
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(users=500, events=200, bookings=200, iterations=1, cold=True)
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the plan of every query.')
+
+    def handle(self, *args, **options):
+        with self.test_environment(options):
+            failures = self._explain_all(options)
+        if failures:
+            raise CommandError("Full table scans:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("Every query uses an index."))
+
+    def _explain_all(self, options):
+        cases, _ = self.build_cases(options)
+        failures = []
+        for name, case in cases.items():
+            connection.queries_log.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                case(0)
+            self.stdout.write(f"\n{name}")
+            for query in ctx.captured_queries:
+                sql = query['sql']
+                if not sql.lstrip().upper().startswith(EXPLAINABLE):
+                    continue
+                with connection.cursor() as cursor:
+                    cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                    plan = [row[-1] for row in cursor.fetchall()]
+                scans = {m.group(1) for m in map(FULL_SCAN.match, plan) if m}
+                bad = scans - ALLOWED_SCANS.get(name, set())
+                temp_sort = any('TEMP B-TREE' in step for step in plan)
+                if bad or temp_sort or options['verbose_plans']:
+                    self.stdout.write(f"  {sql[:160]}")
+                    for step in plan:
+                        self.stdout.write(f"    {step}")
+                for table in sorted(bad):
+                    failures.append(f"{name}: SCAN {table} in {sql[:120]}")
+        return failures
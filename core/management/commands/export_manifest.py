@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.manifest import FOOTER, export_manifest
+from core.models import Event
+
+
+class Command(BaseCommand):
+    help = ("Write an event's offline door-scanner manifest: its booked tickets with QR signatures and seats. "
+            "With --since, only the changes after that manifest version.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('event', type=int, help='Event id.')
+        parser.add_argument('--since', type=int, default=0,
+                            help='Manifest version the scanner already has; writes a delta.')
+        parser.add_argument('--output', help='File to write (default: event-<id>-v<version>.tkm).')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        event_id = options['event']
+        if not Event.objects.filter(pk=event_id).exists():
+            raise CommandError(f"Event {event_id} does not exist.")
+        started = time.monotonic()
+        version, delta, chunks = export_manifest(event_id, options['since'], max(options['chunk_size'], 1))
+        path = options['output'] or f"event-{event_id}-v{version}.tkm"
+        size = 0
+        with open(path, 'wb') as out:
+            for chunk in chunks:
+                out.write(chunk)
+                size += len(chunk)
+        records, removed, _ = FOOTER.unpack(chunk[-FOOTER.size:])
+        kind = f"Delta v{options['since']} -> v{version}" if delta else f"Full manifest v{version}"
+        self.stdout.write(self.style.SUCCESS(
+            f"{kind} for event {event_id}: {records} tickets, {removed} removed, "
+            f"{size} bytes in {time.monotonic() - started:.2f}s -> {path}"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.listings import listing_stats, reset_listing_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters for the cached event listings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = listing_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total * 100 if total else 0
+        self.stdout.write(f"hits: {stats['hits']}  misses: {stats['misses']}  hit rate: {ratio:.1f}%")
+        if options['reset']:
+            reset_listing_stats()
+            self.stdout.write("Counters reset.")
@@ -0,0 +1,99 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.listings import invalidate_listings
+from core.models import AuditoriumBooking, Event, Ticket
+from core.purge import delete_bookings, delete_events, delete_files, orphaned_qr_files
+
+
+class Command(BaseCommand):
+    help = ("Delete events with their tickets and QR images in chunked bulk statements, optionally "
+            "filtered by date, department and status. Much faster and lighter than Event.objects.delete().")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', type=date.fromisoformat, help='Only events dated before YYYY-MM-DD.')
+        parser.add_argument('--after', type=date.fromisoformat, help='Only events dated on or after YYYY-MM-DD.')
+        parser.add_argument('--department', action='append', help='Only this department (repeatable).')
+        parser.add_argument('--status', action='append', choices=[c[0] for c in Event.STATUS_CHOICES],
+                            help='Only events in this status (repeatable).')
+        parser.add_argument('--bookings', action='store_true',
+                            help='Also delete auditorium bookings matching the date and department filters.')
+        parser.add_argument('--gc-media', action='store_true',
+                            help='Also delete QR images under MEDIA_ROOT/qr_codes/ that no ticket references.')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Number of events (or bookings) deleted per transaction (default: 500).')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be deleted.')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive',
+                            help='Do not ask for confirmation when no filter is given.')
+
+    def handle(self, *args, **options):
+        chunk_size = max(options['chunk_size'], 1)
+        events = Event.objects.all()
+        bookings = AuditoriumBooking.objects.all()
+        if options['before']:
+            events = events.filter(event_date__lt=options['before'])
+            bookings = bookings.filter(event_date__lt=options['before'])
+        if options['after']:
+            events = events.filter(event_date__gte=options['after'])
+            bookings = bookings.filter(event_date__gte=options['after'])
+        if options['department']:
+            events = events.filter(department__in=options['department'])
+            bookings = bookings.filter(department__in=options['department'])
+        if options['status']:
+            events = events.filter(status__in=options['status'])
+
+        if options['dry_run']:
+            self.stdout.write(f"Would delete {events.count():,} events with "
+                              f"{Ticket.objects.filter(event__in=events).count():,} tickets"
+                              + (f" and {bookings.count():,} bookings." if options['bookings'] else "."))
+            return
+
+        unfiltered = not any(options[k] for k in ('before', 'after', 'department', 'status'))
+        if unfiltered and options['interactive']:
+            answer = input("No filter given: this deletes ALL events and tickets. Type 'yes' to continue: ")
+            if answer != 'yes':
+                raise CommandError("Purge cancelled.")
+
+        started = time.monotonic()
+        event_count = ticket_count = file_count = 0
+        while True:
+            # re-read the first chunk each time: the previous one is gone
+            ids = list(events.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                deleted, tickets, qr_files = delete_events(ids)
+            file_count += delete_files(qr_files)
+            event_count += deleted
+            ticket_count += tickets
+            self._progress('events', event_count, started, f"{ticket_count:,} tickets, {file_count:,} QR files")
+
+        booking_count = 0
+        if options['bookings']:
+            while True:
+                ids = list(bookings.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+                if not ids:
+                    break
+                with transaction.atomic():
+                    booking_count += delete_bookings(ids)
+                self._progress('bookings', booking_count, started)
+
+        orphans = 0
+        if options['gc_media']:
+            orphans = delete_files(orphaned_qr_files())
+
+        if event_count:
+            invalidate_listings()
+        elapsed = time.monotonic() - started
+        rows = event_count + ticket_count + booking_count
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {event_count:,} events, {ticket_count:,} tickets, {booking_count:,} bookings and "
+            f"{file_count + orphans:,} QR files in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)."))
+
+    def _progress(self, label, done, started, extra=''):
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"{label}: {done:,} ({done / elapsed if elapsed else 0:,.0f}/s)"
+                          + (f", {extra}" if extra else ''))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text event search index (core_event_fts) from the events table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only verify the index against the events table.')
+        parser.add_argument('--optimize', action='store_true',
+                            help='Also merge the index b-trees after rebuilding.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("Full-text search needs SQLite FTS5.")
+        started = time.monotonic()
+        with connection.cursor() as cursor:
+            if options['check']:
+                try:
+                    cursor.execute(search.CHECK_SQL)
+                except Exception as exc:
+                    raise CommandError(f"Search index is out of date ({exc}); run without --check to rebuild.")
+                self.stdout.write(self.style.SUCCESS("Search index matches the events table."))
+                return
+            # recreate the table and triggers in case they were dropped
+            for sql in search.CREATE_SQL + [search.REBUILD_SQL]:
+                cursor.execute(sql)
+            if options['optimize']:
+                cursor.execute(search.OPTIMIZE_SQL)
+            cursor.execute("SELECT COUNT(*) FROM core_event")
+            count = cursor.fetchone()[0]
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count:,} events in {time.monotonic() - started:.1f}s."))
@@ -0,0 +1,61 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+
+from core import seatmap
+from core.listings import invalidate_listings
+from core.models import Event, Ticket
+
+
+class Command(BaseCommand):
+    help = "Recompute Event.booked_count and Event.seat_bitmap from BOOKED tickets and repair any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Number of events checked per transaction (default: 500).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted events without writing.')
+
+    def handle(self, *args, **options):
+        chunk_size = max(options['chunk_size'], 1)
+        dry_run = options['dry_run']
+        checked = repaired = 0
+        last_pk = 0
+
+        while True:
+            # walk the table by primary key so each chunk is an indexed range scan
+            with transaction.atomic():
+                rows = list(
+                    Event.objects.filter(pk__gt=last_pk).order_by('pk')
+                    .annotate(actual=Count('ticket', filter=Q(ticket__status='BOOKED')))
+                    .values_list('pk', 'total_seats', 'booked_count', 'seat_bitmap', 'actual')[:chunk_size]
+                )
+                if not rows:
+                    break
+                seats = defaultdict(list)
+                booked = Ticket.objects.filter(event__in=[r[0] for r in rows],
+                                               status='BOOKED', seat__isnull=False)
+                for event_id, seat in booked.values_list('event_id', 'seat').iterator():
+                    seats[event_id].append(seat)
+
+                for pk, total, stored, bitmap, actual in rows:
+                    bitmap = bytes(bitmap or b'').ljust(len(seatmap.empty(total)), b'\0')
+                    expected = seatmap.encode(seats[pk], total)
+                    if stored == actual and bitmap == expected:
+                        continue
+                    repaired += 1
+                    self.stdout.write(f"Event {pk}: stored {stored}, actual {actual}"
+                                      + ('' if bitmap == expected else ', seat bitmap out of date'))
+                    if not dry_run:
+                        # compare-and-set so a registration racing this chunk is not overwritten
+                        Event.objects.filter(pk=pk, booked_count=stored).update(booked_count=actual,
+                                                                              seat_bitmap=expected)
+            checked += len(rows)
+            last_pk = rows[-1][0]
+
+        if repaired and not dry_run:
+            invalidate_listings()
+        verb = 'would repair' if dry_run else 'repaired'
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} events, {verb} {repaired}."))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import Ticket
+from core.qr import IMAGE_PREFIX, ticket_qr_png
+
+
+class Command(BaseCommand):
+    help = ("Render and store QR images for booked tickets that do not have one yet, "
+            "or only have one for an older payload version.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, help='Only render tickets for this event id.')
+        parser.add_argument('--limit', type=int, help='Stop after this many tickets.')
+        parser.add_argument('--attempts', type=int, default=3,
+                            help='Render attempts per ticket before giving up (default: 3).')
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        tickets = Ticket.objects.filter(status='BOOKED').exclude(qr_code__startswith=IMAGE_PREFIX).order_by('pk')
+        if options['event']:
+            tickets = tickets.filter(event_id=options['event'])
+        if options['limit']:
+            tickets = tickets[:options['limit']]
+
+        started = time.monotonic()
+        rendered = failed = 0
+        for ticket in tickets.iterator(chunk_size=options['chunk_size']):
+            if ticket_qr_png(ticket, attempts=options['attempts']) is None:
+                failed += 1
+            else:
+                rendered += 1
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {rendered} QR codes in {elapsed:.1f}s ({rendered / elapsed if elapsed else 0:.0f}/s)."))
+        if failed:
+            self.stderr.write(f"{failed} tickets failed; re-run the command to retry them.")
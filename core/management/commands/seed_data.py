@@ -0,0 +1,46 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Ticket
+from core.qr import ticket_qr_png
+from core.seeding import seed
+
+
+class Command(BaseCommand):
+    help = ("Generate synthetic users, events, tickets and auditorium bookings in bulk. "
+            "Reproducible for a given --seed; QR images are only rendered with --with-qr.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--events', type=int, default=50)
+        parser.add_argument('--fill', type=float, default=0.5, help='Average fraction of seats booked (default: 0.5).')
+        parser.add_argument('--bookings', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=1234, help='Random seed (default: 1234).')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per bulk insert and transaction.')
+        parser.add_argument('--prefix', default='seed', help='Username prefix; use a new one to add more data.')
+        parser.add_argument('--start', type=date.fromisoformat,
+                            help='First event date, YYYY-MM-DD (default: 30 days ago).')
+        parser.add_argument('--days', type=int, default=120, help='Length of the event date window in days.')
+        parser.add_argument('--password', help='Give every generated user this password (hashed once).')
+        parser.add_argument('--with-qr', action='store_true', help='Also render QR images for the generated tickets.')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=f"{options['prefix']}_user_").exists():
+            raise CommandError(f"Users with prefix {options['prefix']!r} already exist; pass a different --prefix.")
+
+        result = seed(users=options['users'], events=options['events'], fill=options['fill'],
+                      bookings=options['bookings'], seed=options['seed'], batch_size=max(options['batch_size'], 1),
+                      prefix=options['prefix'], start=options['start'], days=max(options['days'], 1),
+                      password=options['password'], progress=self.stdout.write)
+
+        if options['with_qr']:
+            tickets = (Ticket.objects.filter(user__username__startswith=f"{options['prefix']}_user_")
+                       .select_related('user').order_by('pk'))
+            rendered = sum(ticket_qr_png(t) is not None for t in tickets.iterator(chunk_size=500))
+            self.stdout.write(f"QR images: {rendered}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['users']:,} users, {result['events']:,} events, "
+            f"{result['tickets']:,} tickets and {result['bookings']:,} bookings."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'temp_store',
+           'mmap_size', 'foreign_keys', 'wal_autocheckpoint', 'page_size')
+
+SYNCHRONOUS = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+TEMP_STORE = {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'}
+
+
+class Command(BaseCommand):
+    help = "Report the effective SQLite pragmas and connection settings for a database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Database {options['database']!r} is {connection.vendor}, not SQLite.")
+
+        connection.ensure_connection()  # pragmas and transaction_mode apply on connect
+        settings_dict = connection.settings_dict
+        self._report('database', settings_dict['NAME'])
+        self._report('CONN_MAX_AGE', settings_dict.get('CONN_MAX_AGE'))
+        self._report('transaction_mode', connection.transaction_mode or 'DEFERRED (default)')
+        with connection.cursor() as cursor:
+            for pragma in PRAGMAS:
+                cursor.execute(f'PRAGMA {pragma}')
+                value = cursor.fetchone()[0]
+                if pragma == 'synchronous':
+                    value = f'{value} ({SYNCHRONOUS.get(value, "?")})'
+                elif pragma == 'temp_store':
+                    value = f'{value} ({TEMP_STORE.get(value, "?")})'
+                self._report(pragma, value)
+
+    def _report(self, name, value):
+        self.stdout.write(f"{name + ':':<20} {value}")
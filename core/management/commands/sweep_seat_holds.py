@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.holds import sweep_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Delete lapsed seat holds in bulk, oldest first. With --interval, keep sweeping until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float,
+                            help='Sweep again every this many seconds instead of exiting.')
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Holds deleted per statement (default: 1000).')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            removed = sweep_expired_holds(chunk_size=max(options['chunk_size'], 1))
+            if removed or not options['interval']:
+                self.stdout.write(f"Released {removed} lapsed holds in {time.monotonic() - started:.2f}s.")
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,157 @@
+"""Offline door-scanner manifests: an event's booked tickets with their QR signatures and seats.
+
+Layout, big-endian, made to be searched in place:
+
+    header   32 bytes  magic b'TKM1', kind (0 full, 1 delta), seat width,
+                       record size, event id, version, base version (the
+                       version a delta applies to; 0 for full manifests)
+    records  N x 28    ticket id (u64), QR signature (SIGNATURE_BYTES raw),
+                       seat label (NUL padded), sorted by ticket id
+    removed  M x 8     deltas only: sorted ids of tickets no longer valid
+    footer   12 bytes  N, M and the CRC-32 of everything before the footer
+
+A scanner reads a code ``T2.<event>.<ticket>.<sig>``, binary-searches the
+records for the ticket and compares the base32-decoded `sig` with the
+stored signature; `lookup` and `apply_delta` are reference implementations.
+Holding a manifest is as good as holding the tickets' QR codes, so it is
+only served to organizers.
+
+Versions come from `TicketChange`, which SQLite triggers (created by
+migration 0017) append to on every ticket insert, status/seat update and
+delete. SQLite has one writer at a time, so change ids are handed out in
+commit order and an event's newest one is a version stamp no later write
+can slip under. A delta since version V carries the current state of each
+ticket changed after V, so re-syncing a scanner costs bytes per changed
+ticket instead of a full export. Full manifests are streamed from the
+ticket table with `iterator()`, a chunk at a time.
+"""
+import struct
+import zlib
+from collections import namedtuple
+
+from .models import Ticket, TicketChange
+from .qr import SIGNATURE_BYTES, ticket_signature
+
+MAGIC = b'TKM1'
+FULL, DELTA = 0, 1
+SEAT_BYTES = Ticket._meta.get_field('seat').max_length
+
+HEADER = struct.Struct('>4sBBHQQQ')
+RECORD = struct.Struct(f'>Q{SIGNATURE_BYTES}s{SEAT_BYTES}s')
+REMOVED = struct.Struct('>Q')
+FOOTER = struct.Struct('>III')
+
+Manifest = namedtuple('Manifest', 'kind event_id version base records removed')
+
+
+def manifest_version(event_id):
+    """The event's current manifest version: its newest ticket change id, 0 if none was logged."""
+    return TicketChange.objects.filter(event_id=event_id).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def export_manifest(event_id, since=0, chunk_size=2000):
+    """Return ``(version, is_delta, chunks)`` for the event's manifest.
+
+    `chunks` yields the manifest bytes. With `since` set to a version the
+    scanner already has, the manifest is a delta; otherwise (or if `since`
+    is ahead of the current version) it is a full one.
+    """
+    version = manifest_version(event_id)
+    base = since if 0 < since <= version else 0
+    return version, bool(base), _stream(event_id, version, base, chunk_size)
+
+
+def _booked(event_id, chunk_size):
+    return (Ticket.objects.filter(event_id=event_id, status='BOOKED').order_by('pk')
+            .values_list('pk', 'seat').iterator(chunk_size=chunk_size))
+
+
+def _changed(event_id, since, chunk_size, removed):
+    # current state of every ticket changed after `since`; the invalid ones go to `removed`
+    ids = sorted(set(TicketChange.objects.filter(event_id=event_id, id__gt=since)
+                     .values_list('ticket_id', flat=True).iterator(chunk_size=chunk_size)))
+    for i in range(0, len(ids), chunk_size):
+        chunk = ids[i:i + chunk_size]
+        booked = dict(Ticket.objects.filter(pk__in=chunk, event_id=event_id, status='BOOKED')
+                      .values_list('pk', 'seat'))
+        for ticket_id in chunk:
+            if ticket_id in booked:
+                yield ticket_id, booked[ticket_id]
+            else:
+                removed.append(ticket_id)
+
+
+def _record(event_id, ticket_id, seat):
+    return RECORD.pack(ticket_id, ticket_signature(event_id, ticket_id), (seat or '').encode('ascii', 'replace'))
+
+
+def _stream(event_id, version, base, chunk_size):
+    head = HEADER.pack(MAGIC, DELTA if base else FULL, SEAT_BYTES, RECORD.size, event_id, version, base)
+    crc = zlib.crc32(head)
+    yield head
+    removed = []
+    rows = _changed(event_id, base, chunk_size, removed) if base else _booked(event_id, chunk_size)
+    records = 0
+    buf = bytearray()
+    for ticket_id, seat in rows:
+        buf += _record(event_id, ticket_id, seat)
+        records += 1
+        if len(buf) >= chunk_size * RECORD.size:
+            crc = zlib.crc32(buf, crc)
+            yield bytes(buf)
+            buf.clear()
+    for ticket_id in removed:
+        buf += REMOVED.pack(ticket_id)
+    crc = zlib.crc32(buf, crc)
+    yield bytes(buf) + FOOTER.pack(records, len(removed), crc)
+
+
+def read_manifest(data):
+    """Check a manifest's framing and checksum; returns its `Manifest` header fields and counts."""
+    if len(data) < HEADER.size + FOOTER.size:
+        raise ValueError("Manifest is truncated.")
+    magic, kind, seat_bytes, record_size, event_id, version, base = HEADER.unpack_from(data)
+    records, removed, crc = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+    if magic != MAGIC or (seat_bytes, record_size) != (SEAT_BYTES, RECORD.size) or kind not in (FULL, DELTA):
+        raise ValueError("Not a ticket manifest of this format.")
+    if len(data) != HEADER.size + records * RECORD.size + removed * REMOVED.size + FOOTER.size:
+        raise ValueError("Manifest is truncated.")
+    if zlib.crc32(data[:-FOOTER.size]) != crc:
+        raise ValueError("Manifest checksum does not match.")
+    return Manifest(kind, event_id, version, base, records, removed)
+
+
+def _records(data, manifest):
+    end = HEADER.size + manifest.records * RECORD.size
+    return RECORD.iter_unpack(data[HEADER.size:end])
+
+
+def lookup(data, ticket_id):
+    """Binary-search a manifest's records for `ticket_id`; returns ``(signature, seat)`` or None."""
+    lo, hi = 0, FOOTER.unpack_from(data, len(data) - FOOTER.size)[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        found, signature, seat = RECORD.unpack_from(data, HEADER.size + mid * RECORD.size)
+        if found < ticket_id:
+            lo = mid + 1
+        elif found > ticket_id:
+            hi = mid
+        else:
+            return signature, seat.rstrip(b'\0').decode('ascii') or None
+    return None
+
+
+def apply_delta(full, delta):
+    """The full manifest that results from applying `delta` to `full`."""
+    current, change = read_manifest(full), read_manifest(delta)
+    if (current.kind, change.kind) != (FULL, DELTA) or current.event_id != change.event_id \
+            or change.base > current.version:
+        raise ValueError("This delta does not apply to that manifest.")
+    updated = {record[0]: record for record in _records(delta, change)}
+    start = HEADER.size + change.records * RECORD.size
+    gone = {ticket_id for (ticket_id,) in REMOVED.iter_unpack(delta[start:start + change.removed * REMOVED.size])}
+    merged = sorted([r for r in _records(full, current) if r[0] not in updated and r[0] not in gone]
+                    + list(updated.values()))
+    body = HEADER.pack(MAGIC, FULL, SEAT_BYTES, RECORD.size, current.event_id, change.version, 0)
+    body += b''.join(RECORD.pack(*record) for record in merged)
+    return body + FOOTER.pack(len(merged), 0, zlib.crc32(body))
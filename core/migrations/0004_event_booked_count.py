@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_booked_count(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    Ticket = apps.get_model('core', 'Ticket')
+    booked = (Ticket.objects.filter(event=OuterRef('pk'), status='BOOKED')
+              .order_by().values('event').annotate(n=Count('pk')).values('n'))
+    Event.objects.update(booked_count=Coalesce(Subquery(booked), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_ticket_qr_code_alter_event_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='booked_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_booked_count, migrations.RunPython.noop),
+    ]
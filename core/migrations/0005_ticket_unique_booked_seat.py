@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:37
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def release_duplicate_seats(apps, schema_editor):
+    # seats double-booked before the constraint existed: the earliest ticket
+    # keeps the seat, later ones stay registered without a seat label
+    Ticket = apps.get_model('core', 'Ticket')
+    dupes = (Ticket.objects.filter(status='BOOKED', seat__isnull=False)
+             .values('event', 'seat').annotate(n=Count('pk'), keep=Min('pk')).filter(n__gt=1))
+    for row in dupes.iterator():
+        (Ticket.objects.filter(event=row['event'], seat=row['seat'], status='BOOKED')
+         .exclude(pk=row['keep']).update(seat=None))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_event_booked_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(release_duplicate_seats, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='ticket',
+            constraint=models.UniqueConstraint(condition=models.Q(('seat__isnull', False), ('status', 'BOOKED')), fields=('event', 'seat'), name='unique_booked_seat_per_event'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:38
+
+import math
+import re
+from itertools import groupby
+
+from django.db import migrations, models
+
+# the seat map layout as of this migration (core.seatmap), frozen here so
+# later changes to the app module do not change what the backfill does:
+# 10 rows A-J, ceil(total / 10) columns, one bit per seat, MSB first
+ROWS = 10
+LABEL_RE = re.compile(r'^([A-J])([1-9]\d*)$')
+
+
+def encode(labels, total_seats):
+    """Bitmap of the booked seat labels, ignoring any not on the map."""
+    cols = math.ceil(total_seats / ROWS) if total_seats else 0
+    buf = bytearray((total_seats + 7) // 8)
+    for label in labels:
+        m = LABEL_RE.match((label or '').strip().upper())
+        if not m:
+            continue
+        row, col = ord(m.group(1)) - ord('A'), int(m.group(2)) - 1
+        idx = row * cols + col
+        if col < cols and idx < total_seats:
+            buf[idx // 8] |= 0x80 >> (idx % 8)
+    return bytes(buf)
+
+
+def backfill_seat_bitmap(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    Ticket = apps.get_model('core', 'Ticket')
+    totals = dict(Event.objects.values_list('pk', 'total_seats'))
+    booked = (Ticket.objects.filter(status='BOOKED', seat__isnull=False)
+              .order_by('event_id').values_list('event_id', 'seat'))
+    for event_id, rows in groupby(booked.iterator(), key=lambda r: r[0]):
+        bitmap = encode((seat for _, seat in rows), totals[event_id])
+        Event.objects.filter(pk=event_id).update(seat_bitmap=bitmap)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_ticket_unique_booked_seat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='seat_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(backfill_seat_bitmap, migrations.RunPython.noop),
+    ]
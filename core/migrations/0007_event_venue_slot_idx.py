@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_event_seat_bitmap'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['venue', 'event_date', 'start_time', 'end_time'], name='event_venue_slot_idx'),
+        ),
+    ]
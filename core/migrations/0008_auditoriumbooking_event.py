@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CHUNK_SIZE = 500
+
+
+def link_booking_events(apps, schema_editor):
+    # bookings used to be matched to their Event by title/date/time; resolve
+    # that once, a chunk of bookings (and one Event query) at a time
+    AuditoriumBooking = apps.get_model('core', 'AuditoriumBooking')
+    Event = apps.get_model('core', 'Event')
+    last_pk = 0
+    while True:
+        chunk = list(AuditoriumBooking.objects.filter(pk__gt=last_pk, event__isnull=True).order_by('pk')[:CHUNK_SIZE])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        events = {}
+        candidates = (Event.objects.filter(venue='Auditorium', event_date__in={b.event_date for b in chunk})
+                      .order_by('-pk').values_list('pk', 'title', 'event_date', 'start_time', 'end_time'))
+        for pk, *key in candidates:
+            events[tuple(key)] = pk  # lowest pk wins, like the old .first()
+        linked = []
+        for b in chunk:
+            event_id = events.get((b.purpose, b.event_date, b.start_time, b.end_time))
+            if event_id:
+                b.event_id = event_id
+                linked.append(b)
+        AuditoriumBooking.objects.bulk_update(linked, ['event'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_event_venue_slot_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditoriumbooking',
+            name='event',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bookings', to='core.event'),
+        ),
+        migrations.RunPython(link_booking_events, migrations.RunPython.noop),
+    ]
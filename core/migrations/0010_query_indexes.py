@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditoriumbooking',
+            index=models.Index(fields=['requested_by', 'created_at'], name='booking_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditoriumbooking',
+            index=models.Index(fields=['department', 'created_at'], name='booking_dept_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'event_date'], name='event_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_date'], name='event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['event', 'status'], name='ticket_event_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', 'status', 'booked_at'], name='ticket_user_status_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:40
+
+from django.db import migrations
+
+# SQL as of this migration, frozen here (core.search keeps the live copy for
+# rebuild_search_index): an external-content FTS5 index over the searchable
+# event columns, kept in sync by triggers, then filled from the event table
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS core_event_fts USING fts5(title, description, department, venue, "
+    "content='core_event', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS core_event_fts_ai AFTER INSERT ON core_event BEGIN "
+    "INSERT INTO core_event_fts(rowid, title, description, department, venue) "
+    "VALUES (new.id, new.title, new.description, new.department, new.venue); END",
+    "CREATE TRIGGER IF NOT EXISTS core_event_fts_ad AFTER DELETE ON core_event BEGIN "
+    "INSERT INTO core_event_fts(core_event_fts, rowid, title, description, department, venue) "
+    "VALUES ('delete', old.id, old.title, old.description, old.department, old.venue); END",
+    "CREATE TRIGGER IF NOT EXISTS core_event_fts_au AFTER UPDATE OF title, description, department, venue "
+    "ON core_event BEGIN "
+    "INSERT INTO core_event_fts(core_event_fts, rowid, title, description, department, venue) "
+    "VALUES ('delete', old.id, old.title, old.description, old.department, old.venue); "
+    "INSERT INTO core_event_fts(rowid, title, description, department, venue) "
+    "VALUES (new.id, new.title, new.description, new.department, new.venue); END",
+    "INSERT INTO core_event_fts(core_event_fts) VALUES ('rebuild')",
+]
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS core_event_fts_au",
+    "DROP TRIGGER IF EXISTS core_event_fts_ad",
+    "DROP TRIGGER IF EXISTS core_event_fts_ai",
+    "DROP TABLE IF EXISTS core_event_fts",
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_query_indexes'),
+    ]
+
+    operations = [
+        # FTS5 table and sync triggers, populated from the existing events
+        migrations.RunPython(create_fts, drop_fts),
+    ]
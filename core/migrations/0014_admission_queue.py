@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_seathold'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionQueue',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='admission_queue', serialize=False, to='core.event')),
+                ('issued', models.PositiveIntegerField(default=0)),
+                ('next_slot', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='waiting_room',
+            field=models.BooleanField(default=False, help_text='Admit registrations through a waiting room, ADMISSION_RATE per second.'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:34
+
+from django.db import migrations, models
+
+# every ticket insert, status/seat/event update and delete is logged, for
+# manifest versions and deltas (core.manifest); a ticket moved to another
+# event also changes the old event's manifest
+CREATE_SQL = [
+    "CREATE TRIGGER IF NOT EXISTS core_ticketchange_ai AFTER INSERT ON core_ticket BEGIN "
+    "INSERT INTO core_ticketchange(event_id, ticket_id) VALUES (new.event_id, new.id); END",
+    "CREATE TRIGGER IF NOT EXISTS core_ticketchange_au AFTER UPDATE OF event_id, status, seat ON core_ticket BEGIN "
+    "INSERT INTO core_ticketchange(event_id, ticket_id) VALUES (new.event_id, new.id); "
+    "INSERT INTO core_ticketchange(event_id, ticket_id) SELECT old.event_id, old.id "
+    "WHERE old.event_id <> new.event_id; END",
+    "CREATE TRIGGER IF NOT EXISTS core_ticketchange_ad AFTER DELETE ON core_ticket BEGIN "
+    "INSERT INTO core_ticketchange(event_id, ticket_id) VALUES (old.event_id, old.id); END",
+]
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS core_ticketchange_ad",
+    "DROP TRIGGER IF EXISTS core_ticketchange_au",
+    "DROP TRIGGER IF EXISTS core_ticketchange_ai",
+]
+
+
+def create_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_ticket_checked_in_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.BigIntegerField()),
+                ('ticket_id', models.BigIntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event_id', 'id'], name='ticketchange_event_idx')],
+            },
+        ),
+        # ticket change log for manifest versions and deltas
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
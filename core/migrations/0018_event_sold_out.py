@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:58
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_sold_out(apps, schema_editor):
+    # a closed event with no seats left is taken to have sold out
+    Event = apps.get_model('core', 'Event')
+    Event.objects.filter(status='CLOSED', booked_count__gte=F('total_seats')).update(sold_out=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_ticketchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='sold_out',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_sold_out, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
 from django.contrib.auth.models import User
 
+from . import seatmap
+from .listings import invalidate_listings
+
 class Profile(models.Model):
     ROLE_CHOICES = [
         ('student', 'Student'),
@@ -32,12 +36,72 @@ class Event(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='OPEN')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_events')
     created_at = models.DateTimeField(auto_now_add=True)
+    # flash-crowd events: students queue for their turn to register (core.admission)
+    waiting_room = models.BooleanField(
+        default=False, help_text='Admit registrations through a waiting room, ADMISSION_RATE per second.')
+    # denormalized count of BOOKED tickets; only ever changed with F() updates
+    # (see Ticket.cancel / event_register) and repaired by `reconcile_seat_counts`
+    booked_count = models.PositiveIntegerField(default=0, editable=False)
+    # one bit per seat on the A-J seat map (see core.seatmap), written in the
+    # same transaction as the ticket that books or releases the seat
+    seat_bitmap = models.BinaryField(default=b'', editable=False)
+    # set when booking the last seat closed the event, so releasing a seat
+    # reopens it and passes the seat to the waitlist; an event an organizer
+    # closed by hand stays closed
+    sold_out = models.BooleanField(default=False, editable=False)
+
+    class Meta:
+        indexes = [
+            # venue double-booking checks (core.conflicts)
+            models.Index(fields=['venue', 'event_date', 'start_time', 'end_time'], name='event_venue_slot_idx'),
+            # event_list (OPEN events by date), and home / archiving (by date alone)
+            models.Index(fields=['status', 'event_date'], name='event_status_date_idx'),
+            models.Index(fields=['event_date'], name='event_date_idx'),
+        ]
+
+    # columns owned by ticket transactions, never by instance saves
+    TICKET_MAINTAINED_FIELDS = ('booked_count', 'seat_bitmap', 'sold_out')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_total_seats = instance.__dict__.get('total_seats')
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        updating = self.pk and not self._state.adding and not kwargs.get('force_insert')
+        # never write a (possibly stale) in-memory counter or bitmap back over
+        # the atomically maintained columns when updating an existing row
+        if updating and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [f.name for f in self._meta.concrete_fields
+                                       if not f.primary_key and f.name not in self.TICKET_MAINTAINED_FIELDS]
+        # seat labels map to different bits when the column count changes
+        resized = (updating and 'total_seats' in kwargs.get('update_fields', ())
+                   and getattr(self, '_loaded_total_seats', None) not in (None, self.total_seats))
+        # a status set by hand is the organizer's, not capacity's
+        restatused = (updating and 'status' in kwargs.get('update_fields', ())
+                      and getattr(self, '_loaded_status', None) not in (None, self.status))
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if resized:
+                self.rebuild_seat_bitmap()
+            if restatused:
+                Event.objects.filter(pk=self.pk).update(sold_out=False)
+                self.sold_out = False
+        self._loaded_total_seats = self.total_seats
+        self._loaded_status = self.status
+
+    def rebuild_seat_bitmap(self):
+        labels = Ticket.objects.filter(event=self, status='BOOKED', seat__isnull=False).values_list('seat', flat=True)
+        self.seat_bitmap = seatmap.encode(labels, self.total_seats)
+        Event.objects.filter(pk=self.pk).update(seat_bitmap=self.seat_bitmap)
 
     def booked_seats(self):
-        return Ticket.objects.filter(event=self, status='BOOKED').count()
+        return self.booked_count
 
     def available_seats(self):
-        return self.total_seats - self.booked_seats()
+        return max(self.total_seats - self.booked_count, 0)
 
     def __str__(self):
         return f"{self.title} ({self.event_date})"
@@ -54,9 +118,62 @@ class Ticket(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='BOOKED')
     booked_at = models.DateTimeField(auto_now_add=True)
     qr_code = models.ImageField(upload_to='qr_codes/', blank=True, null=True, help_text='QR code for ticket verification')
+    # set when the ticket's QR code is scanned at the door (core.checkin writes it in batches)
+    checked_in_at = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         unique_together = ('event', 'user')
+        indexes = [
+            # per-event BOOKED counts (reconcile_seat_counts, attendance); seat lookups
+            # on BOOKED tickets use the partial unique index below
+            models.Index(fields=['event', 'status'], name='ticket_event_status_idx'),
+            # my_events: a user's BOOKED tickets, newest first
+            models.Index(fields=['user', 'status', 'booked_at'], name='ticket_user_status_idx'),
+        ]
+        constraints = [
+            # a seat can be held by at most one live ticket per event
+            models.UniqueConstraint(fields=['event', 'seat'],
+                                    condition=models.Q(status='BOOKED', seat__isnull=False),
+                                    name='unique_booked_seat_per_event'),
+        ]
+
+    def cancel(self):
+        """Cancel a booked ticket and pass its place on to the event's waitlist.
+
+        If someone is waiting, the seat is booked for the head of the
+        waitlist in the same transaction (`core.waitlist.promote_next`) and
+        the counter and bitmap stay as they are. Otherwise the seat is
+        released on both, and an event that had closed because it was full
+        (`Event.sold_out`) opens again in the same UPDATE; one an organizer
+        closed stays closed and keeps its waitlist waiting. Returns True if
+        the ticket was cancelled by this call, False if it was not (or no
+        longer) BOOKED or has been checked in at the door.
+        """
+        from .waitlist import promote_next
+
+        with transaction.atomic():
+            changed = (Ticket.objects.filter(pk=self.pk, status='BOOKED', checked_in_at__isnull=True)
+                       .update(status='CANCELLED'))
+            if changed and promote_next(self.event_id, self.seat) is None:
+                Event.objects.filter(pk=self.event_id, booked_count__gt=0).update(
+                    booked_count=F('booked_count') - 1,
+                    status=Case(When(status='CLOSED', sold_out=True, then=Value('OPEN')), default=F('status')),
+                    sold_out=False,
+                )
+                if self.seat:
+                    total, bitmap = Event.objects.filter(pk=self.event_id).values_list('total_seats', 'seat_bitmap').get()
+                    try:
+                        bitmap = seatmap.with_seat(bytes(bitmap), total, self.seat, booked=False)
+                    except ValueError:
+                        pass  # legacy label that was never on the map
+                    else:
+                        Event.objects.filter(pk=self.event_id).update(seat_bitmap=bitmap)
+            if changed:
+                # queryset updates send no signals; refresh the cached cards ourselves
+                transaction.on_commit(invalidate_listings)
+        if changed:
+            self.status = 'CANCELLED'
+        return bool(changed)
 
     def __str__(self):
         return f"{self.user.username} - {self.event.title} ({self.status})"
@@ -78,6 +195,158 @@ class AuditoriumBooking(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
     remarks = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # the Event created for this request (PENDING until approved)
+    event = models.ForeignKey(Event, on_delete=models.SET_NULL, null=True, blank=True, related_name='bookings')
+
+    class Meta:
+        indexes = [
+            # the booking queues (pending only by default), newest first
+            models.Index(fields=['status', 'created_at'], name='booking_status_created_idx'),
+            # my_bookings / my_events, and the organizer's department queue, newest first
+            models.Index(fields=['requested_by', 'created_at'], name='booking_user_created_idx'),
+            models.Index(fields=['department', 'created_at'], name='booking_dept_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.purpose} on {self.event_date} ({self.status})"
+
+
+class SeatHold(models.Model):
+    """A seat a user has picked on the seat map, reserved for them until `expires_at`.
+
+    Created and renewed by `core.holds.hold_seat`, turned into a Ticket by
+    `reserve_seat`, and deleted in bulk once lapsed by `sweep_seat_holds`.
+    Lapsed rows are ignored by every read, so sweeping is only housekeeping.
+    """
+    event = models.ForeignKey(Event, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    seat = models.CharField(max_length=10)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            # one holder per seat, and one held seat per user and event
+            models.UniqueConstraint(fields=['event', 'seat'], name='unique_hold_per_seat'),
+            models.UniqueConstraint(fields=['event', 'user'], name='unique_hold_per_user'),
+        ]
+        indexes = [
+            # the sweeper deletes lapsed holds oldest first
+            models.Index(fields=['expires_at'], name='seathold_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.seat} held by {self.user_id} until {self.expires_at}"
+
+
+# Archive of past events (see core.archive / `manage.py archive_events`).
+# Rows keep their original primary keys and are never written by views; they
+# carry no seat map or QR image, only what the history pages show.
+
+class ArchivedEvent(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=150)
+    description = models.TextField()
+    department = models.CharField(max_length=100, blank=True)
+    event_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    venue = models.CharField(max_length=100)
+    total_seats = models.PositiveIntegerField()
+    booked_count = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=Event.STATUS_CHOICES)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['event_date', 'id'], name='archived_event_date_idx')]
+
+    def __str__(self):
+        return f"{self.title} ({self.event_date})"
+
+
+class ArchivedTicket(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name='tickets')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    seat = models.CharField(max_length=10, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=Ticket.STATUS_CHOICES)
+    booked_at = models.DateTimeField()
+    checked_in_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Ticket {self.pk} for archived event {self.event_id} ({self.status})"
+
+
+class ArchivedBooking(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    department = models.CharField(max_length=100)
+    purpose = models.CharField(max_length=200)
+    event_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    expected_audience = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=AuditoriumBooking.STATUS_CHOICES)
+    remarks = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField()
+    # id of the linked event, which is archived alongside (or was deleted)
+    event_id = models.BigIntegerField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.purpose} on {self.event_date} ({self.status})"
+
+
+class WaitlistEntry(models.Model):
+    """A user waiting for a seat on a full event; served in `pk` order by `core.waitlist`."""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'user'], name='unique_waitlist_entry'),
+        ]
+        indexes = [
+            # the head of an event's waitlist, and a user's position in it
+            models.Index(fields=['event', 'id'], name='waitlist_event_order_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} waiting for event {self.event_id}"
+
+
+class AdmissionQueue(models.Model):
+    """Waiting-room state of a `waiting_room` event (see `core.admission`).
+
+    `issued` counts the positions handed out and `next_slot` is the unix
+    time at which the next student to join will be admitted. Written with
+    one UPDATE per student joining; polling the queue never reads it.
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='admission_queue')
+    issued = models.PositiveIntegerField(default=0)
+    next_slot = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"Queue for event {self.event_id}: {self.issued} joined"
+
+
+class TicketChange(models.Model):
+    """Append-only log of ticket inserts, status/seat updates and deletes.
+
+    Written only by SQLite triggers on the ticket table (migration 0017; see
+    `core.manifest`), so every write path is covered; the ids order changes by commit and
+    serve as door-scanner manifest versions. Plain integer columns, not
+    foreign keys: rows outlive the tickets they describe.
+    """
+    event_id = models.BigIntegerField()
+    ticket_id = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            # an event's latest version, and its changes since a given one
+            models.Index(fields=['event_id', 'id'], name='ticketchange_event_idx'),
+        ]
+
+    def __str__(self):
+        return f"Change {self.pk}: ticket {self.ticket_id} of event {self.event_id}"
@@ -0,0 +1,125 @@
+"""Development/test-mode N+1 query detection.
+
+Every SQL statement run inside `detect()` is reduced to its shape
+(parameters and ``IN (...)`` lists collapsed) and counted together with
+the code that triggered it: the innermost template tag or variable being
+rendered, if any, and the nearest frame of project code. A shape repeated
+more than NPLUSONE_THRESHOLD times in one request is almost always a
+related object loaded per row in a loop.
+
+`NPlusOneMiddleware` (enabled with NPLUSONE_DETECT) checks each request,
+logs findings to the ``core.nplusone`` logger, appends them as JSON lines
+to NPLUSONE_REPORT if set, and raises `NPlusOneError` with NPLUSONE_RAISE
+so test clients fail. `benchmark_views` runs the same check on every view.
+"""
+import json
+import logging
+import re
+import sys
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('core.nplusone')
+
+_IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_SPACE = re.compile(r'\s+')
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+_SKIP = (str(Path(__file__).resolve()), str(Path(__file__).resolve().parent / 'timing.py'))
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def normalize(sql):
+    """The statement's shape: whitespace squeezed, IN lists and literal numbers collapsed."""
+    sql = _SPACE.sub(' ', sql.strip())
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _NUMBER.sub('?', sql)
+
+
+def call_site():
+    """Where the current query came from: ``template:line`` and/or ``file:line in func``."""
+    template = python = None
+    frame = sys._getframe(2)
+    while frame is not None and python is None:
+        code = frame.f_code
+        if template is None and code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                template = f"{origin.template_name}:{token.lineno}"
+        filename = code.co_filename
+        if filename.startswith(_PROJECT_ROOT) and filename not in _SKIP and 'site-packages' not in filename:
+            python = f"{Path(filename).relative_to(_PROJECT_ROOT)}:{frame.f_lineno} in {code.co_name}"
+        frame = frame.f_back
+    return ' via '.join(s for s in (template, python) if s) or 'unknown'
+
+
+class QueryShapes:
+    """Execute-wrapper hook counting statements by shape and call site."""
+
+    def __init__(self):
+        self.shapes = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        entry = self.shapes.setdefault(normalize(sql), [0, Counter()])
+        entry[0] += 1
+        entry[1][call_site()] += 1
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        """Shapes run more than `threshold` times, most repeated first."""
+        return [
+            {'sql': shape, 'count': count, 'sites': sites.most_common(3)}
+            for shape, (count, sites) in sorted(self.shapes.items(), key=lambda kv: -kv[1][0])
+            if count > threshold
+        ]
+
+
+@contextmanager
+def detect():
+    """Count the shapes of every query run on any connection inside the block."""
+    shapes = QueryShapes()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(shapes))
+        yield shapes
+
+
+def describe(findings):
+    return '; '.join(
+        f"{f['count']}x {f['sql'][:120]} (from {', '.join(site for site, _ in f['sites'])})" for f in findings)
+
+
+class NPlusOneMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'NPLUSONE_DETECT', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+        self.report = getattr(settings, 'NPLUSONE_REPORT', None)
+        self.fail = getattr(settings, 'NPLUSONE_RAISE', False)
+
+    def __call__(self, request):
+        with detect() as shapes:
+            response = self.get_response(request)
+        findings = shapes.repeated(self.threshold)
+        if findings:
+            message = f"N+1 queries in {request.method} {request.path}: {describe(findings)}"
+            logger.warning(message)
+            if self.report:
+                with open(self.report, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'method': request.method, 'path': request.path,
+                                        'findings': findings}) + '\n')
+            if self.fail:
+                raise NPlusOneError(message)
+        return response
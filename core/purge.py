@@ -0,0 +1,103 @@
+"""Bulk deletion of events and everything hanging off them.
+
+`QuerySet.delete()` runs Django's collector, which loads every event and
+ticket into memory to cascade and fire signals, and leaves each ticket's
+QR image behind under MEDIA_ROOT/qr_codes/. `delete_events` instead issues
+plain DELETE statements for one chunk of event ids, in foreign-key order:
+bookings are detached, then admission queues, waitlists, seat holds,
+tickets (with the change log entries their deletion writes) and events
+removed. It returns the QR files the chunk owned so the
+caller can remove them once the transaction has committed. Signals are
+bypassed, so callers invalidate the listings cache themselves.
+"""
+import logging
+
+from django.core.files.storage import default_storage
+from django.db import connection
+
+from .models import AdmissionQueue, AuditoriumBooking, Event, SeatHold, Ticket, TicketChange, WaitlistEntry
+
+logger = logging.getLogger(__name__)
+
+QR_DIR = 'qr_codes'
+
+
+def _in_clause(ids):
+    return ', '.join(['%s'] * len(ids))
+
+
+def delete_events(event_ids):
+    """Delete the events in `event_ids` with their tickets; run inside a transaction.
+
+    Returns ``(events, tickets, qr_files)``: the deleted row counts and the
+    storage names of the QR images that belonged to the deleted tickets.
+    """
+    event_ids = list(event_ids)
+    if not event_ids:
+        return 0, 0, []
+    qn = connection.ops.quote_name
+    placeholders = _in_clause(event_ids)
+    qr_files = list(
+        Ticket.objects.filter(event_id__in=event_ids).exclude(qr_code='').exclude(qr_code__isnull=True)
+        .values_list('qr_code', flat=True)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {qn(AuditoriumBooking._meta.db_table)} SET {qn('event_id')} = NULL "
+            f"WHERE {qn('event_id')} IN ({placeholders})", event_ids)
+        for model in (AdmissionQueue, WaitlistEntry, SeatHold):
+            cursor.execute(
+                f"DELETE FROM {qn(model._meta.db_table)} WHERE {qn('event_id')} IN ({placeholders})", event_ids)
+        cursor.execute(
+            f"DELETE FROM {qn(Ticket._meta.db_table)} WHERE {qn('event_id')} IN ({placeholders})", event_ids)
+        tickets = cursor.rowcount
+        cursor.execute(
+            f"DELETE FROM {qn(TicketChange._meta.db_table)} WHERE {qn('event_id')} IN ({placeholders})", event_ids)
+        cursor.execute(
+            f"DELETE FROM {qn(Event._meta.db_table)} WHERE {qn('id')} IN ({placeholders})", event_ids)
+        events = cursor.rowcount
+    return events, tickets, qr_files
+
+
+def delete_bookings(booking_ids):
+    """Delete the auditorium bookings in `booking_ids`; returns the row count."""
+    booking_ids = list(booking_ids)
+    if not booking_ids:
+        return 0
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {qn(AuditoriumBooking._meta.db_table)} "
+                       f"WHERE {qn('id')} IN ({_in_clause(booking_ids)})", booking_ids)
+        return cursor.rowcount
+
+
+def delete_files(names):
+    """Remove stored files, logging (not raising) on failure; returns how many were removed."""
+    removed = 0
+    for name in names:
+        try:
+            default_storage.delete(name)
+            removed += 1
+        except OSError:
+            logger.warning("Could not delete %s", name, exc_info=True)
+    return removed
+
+
+def _stored_files(path):
+    try:
+        dirs, files = default_storage.listdir(path)
+    except FileNotFoundError:
+        return []
+    names = [f'{path}/{f}' for f in files]
+    for d in dirs:
+        names += _stored_files(f'{path}/{d}')
+    return names
+
+
+def orphaned_qr_files(chunk_size=1000):
+    """Yield QR images under MEDIA_ROOT/qr_codes/ (and its per-version folders) that no ticket references."""
+    files = _stored_files(QR_DIR)
+    for i in range(0, len(files), chunk_size):
+        names = files[i:i + chunk_size]
+        referenced = set(Ticket.objects.filter(qr_code__in=names).values_list('qr_code', flat=True))
+        yield from (n for n in names if n not in referenced)
@@ -0,0 +1,110 @@
+"""Ticket QR images, rendered on demand instead of during registration.
+
+`ticket_qr_png` serves the stored PNG when there is one and otherwise
+renders it, caches it under MEDIA_ROOT/qr_codes/ and records it on the
+ticket. It is used by the `ticket_qr` view and the `render_ticket_qr`
+batch command; a failed render is logged and simply retried on the next
+request or batch run.
+
+The code carries a compact signed payload, ``T2.<event id>.<ticket id>.<sig>``,
+where `sig` is an HMAC-SHA256 of the ids (keyed by QR_SIGNING_KEY, or
+SECRET_KEY), truncated to 80 bits and base32 encoded so the whole payload
+fits the QR alphanumeric mode. `verify_payload` checks it without touching
+the database, for check-in at the door (`core.checkin`). Images stored for
+an older payload version are re-rendered when next requested.
+"""
+import base64
+import logging
+import re
+from io import BytesIO
+
+import qrcode
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .models import Ticket
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_VERSION = 2
+# stored images of the current payload version live under this prefix
+IMAGE_PREFIX = f'qr_codes/v{PAYLOAD_VERSION}/'
+SIGNATURE_BYTES = 10  # 16 base32 characters
+
+_PAYLOAD = re.compile(rf'^T{PAYLOAD_VERSION}\.(\d{{1,18}})\.(\d{{1,18}})\.([A-Z2-7]{{16}})$', re.ASCII)
+
+
+def ticket_signature(event_id, ticket_id):
+    """The raw SIGNATURE_BYTES of a ticket's QR signature (see `core.manifest`)."""
+    mac = salted_hmac('core.qr', f'{event_id}.{ticket_id}',
+                      secret=getattr(settings, 'QR_SIGNING_KEY', None), algorithm='sha256')
+    return mac.digest()[:SIGNATURE_BYTES]
+
+
+def _signature(event_id, ticket_id):
+    return base64.b32encode(ticket_signature(event_id, ticket_id)).decode('ascii')
+
+
+def qr_payload(ticket):
+    return f"T{PAYLOAD_VERSION}.{ticket.event_id}.{ticket.pk}.{_signature(ticket.event_id, ticket.pk)}"
+
+
+def verify_payload(data):
+    """Return ``(event_id, ticket_id)`` from a genuine QR payload, or None."""
+    match = _PAYLOAD.match((data or '').strip().upper())
+    if match is None:
+        return None
+    event_id, ticket_id = int(match.group(1)), int(match.group(2))
+    if not constant_time_compare(match.group(3), _signature(event_id, ticket_id)):
+        return None
+    return event_id, ticket_id
+
+
+def render_qr_png(data):
+    qr = qrcode.QRCode(version=1, box_size=10, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    img_io = BytesIO()
+    img.save(img_io, format='PNG')
+    return img_io.getvalue()
+
+
+def ticket_qr_png(ticket, attempts=3):
+    """Return the PNG bytes for `ticket`, rendering and storing it if needed.
+
+    Returns None if every render attempt failed.
+    """
+    if ticket.qr_code and ticket.qr_code.name.startswith(IMAGE_PREFIX):
+        try:
+            with ticket.qr_code.open('rb') as f:
+                return f.read()
+        except OSError:
+            logger.warning("QR image %s for ticket %s is missing; re-rendering", ticket.qr_code.name, ticket.pk)
+
+    for attempt in range(1, attempts + 1):
+        try:
+            png = render_qr_png(qr_payload(ticket))
+            break
+        except Exception:
+            logger.warning("QR render attempt %d/%d failed for ticket %s", attempt, attempts, ticket.pk, exc_info=True)
+    else:
+        logger.error("Giving up on QR code for ticket %s after %d attempts", ticket.pk, attempts)
+        return None
+
+    stale = ticket.qr_code.name if ticket.qr_code else None
+    try:
+        ticket.qr_code.save(f'v{PAYLOAD_VERSION}/ticket_{ticket.id}.png', ContentFile(png), save=False)
+        Ticket.objects.filter(pk=ticket.pk).update(qr_code=ticket.qr_code.name)
+    except Exception:
+        # the image is still served; storing it is retried on the next request
+        logger.exception("Could not store QR code for ticket %s", ticket.pk)
+    else:
+        if stale:
+            # an image of an older payload version; `purge_events --gc-media` catches any left behind
+            try:
+                ticket.qr_code.storage.delete(stale)
+            except OSError:
+                logger.warning("Could not delete stale QR image %s", stale, exc_info=True)
+    return png
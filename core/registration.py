@@ -0,0 +1,132 @@
+"""Race-free seat reservation used by `event_register`.
+
+Capacity is claimed with a single conditional UPDATE on `Event` (which also
+flips the event to CLOSED when the last seat goes) and the seat itself is
+claimed by setting its bit in `Event.seat_bitmap` and inserting the `Ticket`
+under the `unique_booked_seat_per_event` constraint. All of it happens in one
+short transaction, so a losing request rolls back its capacity claim instead
+of overselling. Events with a waiting room only take registrations from
+students the queue has admitted (see `core.admission`); seats released by
+`Ticket.cancel` go to the event's waitlist first (see `core.waitlist`).
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from . import seatmap
+from .listings import invalidate_listings
+from .models import Event, SeatHold, Ticket, WaitlistEntry
+
+
+class RegistrationError(Exception):
+    """Base class for reservation failures; `message` is user-facing."""
+    message = "Registration failed."
+
+
+class EventFull(RegistrationError):
+    message = "No seats available."
+
+
+class AlreadyRegistered(RegistrationError):
+    message = "You are already registered for this event."
+
+
+class SeatTaken(RegistrationError):
+    message = "Selected seat is already taken. Choose a different seat."
+
+
+class SeatHeld(SeatTaken):
+    message = "Someone else is holding that seat right now. Choose a different seat."
+
+
+class InvalidSeat(RegistrationError):
+    message = "Selected seat does not exist. Choose a seat from the seat map."
+
+
+class NotAdmitted(RegistrationError):
+    message = "This event has a waiting room. Join the queue and register when it is your turn."
+
+
+class SeatsAvailable(RegistrationError):
+    message = "This event still has seats, so there is no waitlist to join."
+
+
+def reserve_seat(event_id, user, seat=None, admitted=False):
+    """Book `seat` (or an unassigned place) on an OPEN event for `user`.
+
+    Costs one UPDATE, one INSERT and the DELETEs of the user's seat hold and
+    waitlist entry on success, plus a SELECT and UPDATE of the seat bitmap and
+    a hold check when a seat is chosen. Raises `EventFull` when the event is
+    not OPEN or has no capacity left, `InvalidSeat` for labels that are not on
+    the seat map, `SeatHeld` when another user holds the seat (see
+    `core.holds`), and `AlreadyRegistered` or `SeatTaken` when the seat or the
+    ticket is already claimed. Unless `admitted` (the user holds a current
+    queue token), waiting-room events refuse with `NotAdmitted`, at the cost
+    of one more SELECT on that path only.
+
+    Tickets are unique per event and user, so a user who cancelled earlier
+    gets their old ticket booked again; that path retries once after the
+    INSERT fails.
+    """
+    seat = (seat or '').strip().upper() or None
+    try:
+        return _book(event_id, user, seat, admitted)
+    except IntegrityError:
+        # the transaction has been rolled back; find out which constraint fired
+        status = Ticket.objects.filter(event_id=event_id, user=user).values_list('status', flat=True).first()
+    if status == 'CANCELLED':
+        try:
+            return _book(event_id, user, seat, admitted, rebook=True)
+        except IntegrityError:
+            status = Ticket.objects.filter(event_id=event_id, user=user).values_list('status', flat=True).first()
+    if status == 'BOOKED':
+        raise AlreadyRegistered()
+    raise SeatTaken()
+
+
+def _book(event_id, user, seat, admitted, rebook=False):
+    with transaction.atomic():
+        # claim capacity first: the UPDATE takes SQLite's write lock up
+        # front, so concurrent registrations queue instead of deadlocking
+        open_events = Event.objects.filter(pk=event_id, status='OPEN')
+        if not admitted:
+            open_events = open_events.filter(waiting_room=False)
+        claimed = open_events.filter(booked_count__lt=F('total_seats')).update(
+            booked_count=F('booked_count') + 1,
+            status=Case(When(booked_count__gte=F('total_seats') - 1, then=Value('CLOSED')),
+                        default=F('status')),
+            sold_out=Case(When(booked_count__gte=F('total_seats') - 1, then=Value(True)),
+                          default=F('sold_out')),
+        )
+        if not claimed:
+            if not admitted and Event.objects.filter(pk=event_id, status='OPEN', waiting_room=True).exists():
+                raise NotAdmitted()
+            raise EventFull()
+        if seat:
+            # the capacity UPDATE above already holds the write lock, so
+            # this read-modify-write of the bitmap cannot interleave
+            total, bitmap = Event.objects.filter(pk=event_id).values_list('total_seats', 'seat_bitmap').get()
+            idx = seatmap.seat_index(seat, total)
+            if idx is None:
+                raise InvalidSeat()
+            if seatmap.is_set(bytes(bitmap), idx):
+                raise SeatTaken()
+            # a seat picked (and so held) by someone else on the seat map is theirs until it lapses
+            if (SeatHold.objects.filter(event_id=event_id, seat=seat, expires_at__gt=timezone.now())
+                    .exclude(user=user).exists()):
+                raise SeatHeld()
+        if rebook:
+            if not Ticket.objects.filter(event_id=event_id, user=user, status='CANCELLED').update(
+                    status='BOOKED', seat=seat, booked_at=timezone.now(), checked_in_at=None):
+                raise AlreadyRegistered()
+            ticket = Ticket.objects.get(event_id=event_id, user=user)
+        else:
+            ticket = Ticket.objects.create(event_id=event_id, user=user, seat=seat, status='BOOKED')
+        if seat:
+            Event.objects.filter(pk=event_id).update(seat_bitmap=seatmap.with_seat(bytes(bitmap), total, seat))
+        # the user's hold, if any, has become this ticket, and they no longer wait for one
+        SeatHold.objects.filter(event_id=event_id, user=user).delete()
+        WaitlistEntry.objects.filter(event_id=event_id, user=user).delete()
+        # the capacity and re-booking UPDATEs send no signals; refresh the cached cards ourselves
+        transaction.on_commit(invalidate_listings)
+        return ticket
@@ -0,0 +1,102 @@
+"""Full-text event search on an SQLite FTS5 index.
+
+``core_event_fts`` is an external-content FTS5 table over the title,
+description, department and venue of `core_event`. Triggers on the event
+table keep it in sync with every write path, including bulk inserts and
+the raw deletes in `core.purge`; the update trigger only fires when an
+indexed column changes, so seat counter updates never touch it.
+`manage.py rebuild_search_index` rebuilds it from scratch.
+
+`search_events` returns OPEN events ranked by BM25 (title matches weigh
+most) together with per-department counts for the whole result set,
+computed in a single GROUP BY over the same match.
+"""
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import Event
+
+FTS_TABLE = 'core_event_fts'
+FTS_COLUMNS = ('title', 'description', 'department', 'venue')
+# bm25() weights, in FTS_COLUMNS order
+RANK_WEIGHTS = (10.0, 1.0, 3.0, 2.0)
+
+_cols = ', '.join(FTS_COLUMNS)
+_new = ', '.join(f'new.{c}' for c in FTS_COLUMNS)
+_old = ', '.join(f'old.{c}' for c in FTS_COLUMNS)
+
+CREATE_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({_cols}, "
+    f"content='core_event', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON core_event BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_cols}) VALUES (new.id, {_new}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON core_event BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_cols}) VALUES ('delete', old.id, {_old}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_cols} ON core_event BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_cols}) VALUES ('delete', old.id, {_old}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_cols}) VALUES (new.id, {_new}); END",
+]
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+OPTIMIZE_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"
+# rank=1 also compares the index against the content table
+CHECK_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('integrity-check', 1)"
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def match_expression(query):
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    Returns None when the text has no searchable words. User input never
+    reaches FTS5 syntax (quotes, NEAR, column filters) unescaped.
+    """
+    terms = _TERM.findall(query or '')[:10]
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def matching_ids(query):
+    """A subquery of the event ids matching `query`, for ``filter(pk__in=...)``; None if nothing to match."""
+    expression = match_expression(query)
+    if expression is None:
+        return None
+    return RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])
+
+
+def search_events(query, department=None, limit=50):
+    """Return ``(events, facets)`` for OPEN events matching `query`.
+
+    `events` are the best `limit` matches (optionally within `department`),
+    best first; `facets` is a list of ``(department, count)`` over all
+    matches regardless of the department filter, largest first.
+    """
+    expression = match_expression(query)
+    if expression is None:
+        return [], []
+    weights = ', '.join(str(w) for w in RANK_WEIGHTS)
+    where = f"{FTS_TABLE} MATCH %s AND e.status = 'OPEN'"
+    params = [expression]
+    if department:
+        where += " AND e.department = %s"
+        params.append(department)
+    events = list(Event.objects.raw(
+        f"SELECT e.* FROM {FTS_TABLE} JOIN core_event e ON e.id = {FTS_TABLE}.rowid "
+        f"WHERE {where} ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s", params + [limit]))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT e.department, COUNT(*) FROM {FTS_TABLE} JOIN core_event e ON e.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND e.status = 'OPEN' GROUP BY e.department ORDER BY 2 DESC, 1",
+            [expression])
+        facets = cursor.fetchall()
+    return events, facets
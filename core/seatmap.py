@@ -0,0 +1,78 @@
+"""Seat labels and the compact per-event occupancy bitmap.
+
+The layout matches the seat map drawn in `event_detail.html`: 10 rows
+labelled A-J and `ceil(total_seats / 10)` columns numbered from 1, filled
+row by row, so seat index ``row * cols + col`` covers ``0 .. total_seats-1``.
+
+The bitmap stores one bit per seat index, most significant bit first
+(index 0 is ``0x80`` of byte 0). A set bit means the seat is BOOKED.
+"""
+import math
+import re
+
+ROWS = 10
+
+_LABEL_RE = re.compile(r'^([A-J])([1-9]\d*)$')
+
+
+def columns(total_seats):
+    return math.ceil(total_seats / ROWS) if total_seats else 0
+
+
+def seat_index(label, total_seats):
+    """Return the bitmap index for a label like 'B3', or None if it is not on the map."""
+    m = _LABEL_RE.match((label or '').strip().upper())
+    if not m:
+        return None
+    cols = columns(total_seats)
+    row, col = ord(m.group(1)) - ord('A'), int(m.group(2)) - 1
+    if col >= cols:
+        return None
+    idx = row * cols + col
+    return idx if idx < total_seats else None
+
+
+def seat_label(index, total_seats):
+    cols = columns(total_seats)
+    return f"{chr(ord('A') + index // cols)}{index % cols + 1}"
+
+
+def empty(total_seats):
+    return bytes((total_seats + 7) // 8)
+
+
+def is_set(bitmap, index):
+    byte = index // 8
+    return byte < len(bitmap) and bool(bitmap[byte] & (0x80 >> (index % 8)))
+
+
+def with_seat(bitmap, total_seats, label, booked=True):
+    """Return a copy of `bitmap` with `label` marked booked (or free).
+
+    Raises ValueError if the label is not on this event's map.
+    """
+    idx = seat_index(label, total_seats)
+    if idx is None:
+        raise ValueError(f"Seat {label!r} is not on the seat map.")
+    buf = bytearray(bitmap or b'')
+    if len(buf) < (total_seats + 7) // 8:
+        buf.extend(bytes((total_seats + 7) // 8 - len(buf)))
+    if booked:
+        buf[idx // 8] |= 0x80 >> (idx % 8)
+    else:
+        buf[idx // 8] &= ~(0x80 >> (idx % 8)) & 0xFF
+    return bytes(buf)
+
+
+def encode(labels, total_seats):
+    """Build a bitmap from booked seat labels, ignoring any not on the map."""
+    buf = bytearray(empty(total_seats))
+    for label in labels:
+        idx = seat_index(label, total_seats)
+        if idx is not None:
+            buf[idx // 8] |= 0x80 >> (idx % 8)
+    return bytes(buf)
+
+
+def booked_labels(bitmap, total_seats):
+    return [seat_label(i, total_seats) for i in range(total_seats) if is_set(bitmap, i)]
@@ -0,0 +1,158 @@
+"""Bulk synthetic data for benchmarks, load testing and local demos.
+
+Rows are generated in batches and written with `bulk_create`, one
+transaction per batch, so memory stays flat at semester scale (tens of
+thousands of events, hundreds of thousands of users, millions of
+tickets). `Event.booked_count` and `Event.seat_bitmap` are computed while
+the tickets are generated, so the result needs no reconcile pass. A fixed
+`seed` makes runs reproducible. No QR images are rendered here; see the
+`seed_data --with-qr` option.
+"""
+import random
+import time
+from datetime import date, time as clock, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import seatmap
+from .models import AuditoriumBooking, Event, Profile, Ticket
+
+# (department, weight)
+DEPARTMENTS = [('CSE', 30), ('IT', 15), ('ECE', 15), ('EEE', 10), ('MECH', 10),
+               ('CIVIL', 8), ('MBA', 7), ('BioTech', 5)]
+# (venue, capacity, weight): small rooms host most events
+VENUES = [('Auditorium', 500, 8), ('Open Air Theatre', 300, 4), ('Seminar Hall', 200, 18),
+          ('Classroom 101', 60, 30), ('Lab A', 60, 20), ('Lab B', 40, 20)]
+TOPICS = ['Workshop', 'Seminar', 'Hackathon', 'Bootcamp', 'Guest Lecture', 'Symposium', 'Quiz', 'Meetup']
+SUBJECTS = ['Python', 'Web Development', 'Data Science', 'Cloud Computing', 'Machine Learning',
+            'Robotics', 'IoT', 'Cyber Security', 'Entrepreneurship', 'Embedded Systems']
+# start hour weights, 9:00-17:00 with a late-morning peak
+START_HOURS = [(9, 10), (10, 20), (11, 18), (12, 6), (13, 8), (14, 16), (15, 12), (16, 7), (17, 3)]
+
+
+def _weighted(rng, pairs):
+    return rng.choices([p[0] for p in pairs], weights=[p[-1] for p in pairs])[0]
+
+
+class Progress:
+    """Report rows written and throughput of the current phase through `write`."""
+
+    def __init__(self, write=None):
+        self.write = write
+        self.phase()
+
+    def phase(self):
+        self.started = time.monotonic()
+
+    def __call__(self, label, done, total=None):
+        if self.write:
+            elapsed = time.monotonic() - self.started
+            rate = done / elapsed if elapsed else 0
+            count = f"{done:,}/{total:,}" if total else f"{done:,}"
+            self.write(f"{label}: {count} ({rate:,.0f} rows/s, {elapsed:.1f}s)")
+
+
+def seed(users=200, events=100, fill=0.5, bookings=50, seed=1234, batch_size=2000, prefix='seed',
+         start=None, days=120, password=None, progress=None):
+    """Generate users, events with tickets, and auditorium bookings.
+
+    - `users` students (about 3% organizers), spread over weighted departments;
+      `password` (if given) is hashed once and shared by all of them.
+    - `events` events on weekdays (rarely weekends) from `start` over `days`
+      days, in weighted venues whose capacity sets `total_seats`.
+    - each event is booked to a Beta-distributed fraction around `fill`,
+      with random distinct seats from the A-J seat map; sold-out OPEN
+      events are CLOSED, as `event_register` would leave them.
+    - `bookings` auditorium requests in mixed states.
+
+    Returns a dict of row counts plus the first generated user's pk.
+    """
+    rng = random.Random(seed)
+    start = start or date.today() - timedelta(days=30)
+    report = Progress(progress)
+    password_hash = make_password(password) if password else '!'
+
+    user_ids = []
+    for offset in range(0, users, batch_size):
+        n = min(batch_size, users - offset)
+        with transaction.atomic():
+            created = User.objects.bulk_create(
+                [User(username=f'{prefix}_user_{offset + i}', password=password_hash) for i in range(n)])
+            Profile.objects.bulk_create([
+                Profile(user=u, role='organizer' if rng.random() < 0.03 else 'student',
+                        department=_weighted(rng, DEPARTMENTS))
+                for u in created
+            ])
+        user_ids.extend(u.pk for u in created)
+        report('users', len(user_ids), users)
+
+    report.phase()
+    ticket_count = event_count = 0
+    # the mean of Beta(a, b) is a / (a + b); keep it at `fill` with a spread of about +-0.2
+    fill = min(max(fill, 0.01), 0.99)
+    beta_a, beta_b = fill * 4, (1 - fill) * 4
+    for offset in range(0, events, batch_size):
+        n = min(batch_size, events - offset)
+        batch, tickets = [], []
+        for i in range(offset, offset + n):
+            venue, capacity, _ = VENUES[rng.choices(range(len(VENUES)), weights=[v[2] for v in VENUES])[0]]
+            day = start + timedelta(days=rng.randrange(days))
+            while day.weekday() >= 5 and rng.random() < 0.9:
+                day += timedelta(days=1)
+            hour = _weighted(rng, START_HOURS)
+            booked = min(int(capacity * rng.betavariate(beta_a, beta_b)), capacity, len(user_ids))
+            labels = [seatmap.seat_label(idx, capacity) for idx in rng.sample(range(capacity), booked)]
+            status = 'OPEN' if rng.random() < 0.85 else rng.choice(['CLOSED', 'PENDING'])
+            if status == 'PENDING':
+                labels, booked = [], 0
+            elif booked >= capacity:
+                status = 'CLOSED'
+            event = Event(
+                title=f'{rng.choice(SUBJECTS)} {rng.choice(TOPICS)} #{i}',
+                description='Generated event for load testing.',
+                department=_weighted(rng, DEPARTMENTS),
+                event_date=day, start_time=clock(hour), end_time=clock(min(hour + rng.choice([1, 2, 3]), 23)),
+                venue=venue, total_seats=capacity, status=status,
+                booked_count=booked, seat_bitmap=seatmap.encode(labels, capacity),
+                sold_out=status == 'CLOSED' and booked >= capacity,
+            )
+            event._seed_tickets = list(zip(rng.sample(user_ids, booked), labels))
+            batch.append(event)
+
+        with transaction.atomic():
+            Event.objects.bulk_create(batch)
+            for event in batch:
+                tickets.extend(Ticket(event_id=event.pk, user_id=user_id, seat=label, status='BOOKED')
+                               for user_id, label in event._seed_tickets)
+                if len(tickets) >= batch_size:
+                    Ticket.objects.bulk_create(tickets)
+                    ticket_count += len(tickets)
+                    tickets = []
+            Ticket.objects.bulk_create(tickets)
+            ticket_count += len(tickets)
+        event_count += n
+        report('events', event_count, events)
+        report('tickets', ticket_count)
+
+    report.phase()
+    for offset in range(0, bookings, batch_size):
+        n = min(batch_size, bookings - offset)
+        rows = []
+        for i in range(offset, offset + n):
+            hour = _weighted(rng, START_HOURS)
+            rows.append(AuditoriumBooking(
+                requested_by_id=rng.choice(user_ids), department=_weighted(rng, DEPARTMENTS),
+                purpose=f'{rng.choice(SUBJECTS)} {rng.choice(TOPICS)} request #{i}',
+                event_date=start + timedelta(days=rng.randrange(days)),
+                start_time=clock(hour), end_time=clock(min(hour + 2, 23)),
+                expected_audience=rng.randrange(50, 501),
+                status=rng.choices(['PENDING', 'APPROVED', 'REJECTED'], weights=[5, 3, 2])[0],
+            ))
+        with transaction.atomic():
+            AuditoriumBooking.objects.bulk_create(rows)
+        report('bookings', offset + n, bookings)
+
+    return {'users': len(user_ids), 'events': event_count, 'tickets': ticket_count, 'bookings': bookings,
+            'first_user_id': user_ids[0] if user_ids else None}
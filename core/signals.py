@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth import bump_role_generation
+from .listings import invalidate_listings
+from .models import Event, Profile, Ticket
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    # roles cached in sessions (PROFILE_ROLE_SESSION_CACHE) must be re-read
+    bump_role_generation(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=Ticket)
+def listing_changed(sender, **kwargs):
+    # after commit, so no worker can re-cache the pre-change rows under the new version
+    transaction.on_commit(invalidate_listings)
@@ -0,0 +1,368 @@
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import admission, checkin, manifest, seatmap
+from .holds import hold_seat
+from .models import Event, Profile, SeatHold, Ticket, WaitlistEntry
+from .qr import qr_payload, ticket_signature
+from .registration import (AlreadyRegistered, EventFull, InvalidSeat, NotAdmitted, SeatHeld, SeatsAvailable,
+                           SeatTaken, reserve_seat)
+from .waitlist import join_waitlist, waitlist_position
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def make_event(**fields):
+    fields = {'title': 'Test event', 'description': '-', 'event_date': date.today(), 'start_time': '10:00',
+              'end_time': '11:00', 'venue': 'Test Hall', 'total_seats': 10, **fields}
+    return Event.objects.create(**fields)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SignUpTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_signup_logs_the_new_user_in(self):
+        response = self.client.post(reverse('signup'), {
+            'username': 'newstudent', 'first_name': 'New', 'last_name': 'Student', 'email': 'new@example.com',
+            'password1': 'a-long-passphrase-42', 'password2': 'a-long-passphrase-42', 'role': 'student',
+        }, follow=True)
+        self.assertRedirects(response, reverse('home'))
+        user = User.objects.get(username='newstudent')
+        self.assertEqual(response.context['user'], user)
+        self.assertEqual(Profile.objects.get(user=user).role, 'student')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SeatHoldTests(TestCase):
+    def test_own_hold_is_preselected_after_reload(self):
+        event = make_event()
+        user, other = User.objects.create_user('student'), User.objects.create_user('other')
+        hold_seat(event.pk, user, 'A1')
+        hold_seat(event.pk, other, 'B1')
+        self.client.force_login(user)
+
+        response = self.client.get(reverse('event_detail', args=[event.pk]))
+        self.assertEqual(response.context['held_seats'], ['B1'])
+        self.assertEqual(response.context['my_hold'], 'A1')
+
+    def test_registered_user_cannot_hold_another_seat(self):
+        event = make_event()
+        user = User.objects.create_user('student')
+        reserve_seat(event.pk, user, 'A1')
+
+        with self.assertRaises(AlreadyRegistered):
+            hold_seat(event.pk, user, 'B1')
+        self.assertFalse(SeatHold.objects.filter(event=event).exists())
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class RegistrationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('student', password='x')
+        Profile.objects.create(user=self.user, role='student')
+        self.client.force_login(self.user)
+        checkin._events.clear()
+
+    def test_rebooking_the_last_seat_refreshes_the_listing(self):
+        event = make_event(total_seats=1)
+        Ticket.objects.create(event=event, user=self.user, status='CANCELLED')
+        cards = self.client.get(reverse('event_list')).context['events']
+        self.assertEqual([c['available_seats'] for c in cards if c['pk'] == event.pk], [1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve_seat(event.pk, self.user)
+        event.refresh_from_db()
+        self.assertEqual(event.status, 'CLOSED')
+        cards = self.client.get(reverse('event_list')).context['events']
+        self.assertNotIn(event.pk, [c['pk'] for c in cards])
+
+    def test_rebooked_ticket_checks_in_again(self):
+        event = make_event()
+        # an earlier booking, checked in and then cancelled by staff
+        Ticket.objects.create(event=event, user=self.user, status='CANCELLED', checked_in_at=timezone.now())
+
+        ticket = reserve_seat(event.pk, self.user)
+        self.assertEqual(ticket.status, 'BOOKED')
+        self.assertIsNone(ticket.checked_in_at)
+        self.assertEqual(checkin.scan(event.pk, qr_payload(ticket))['result'], 'checked_in')
+
+    def test_promoted_ticket_checks_in_again(self):
+        event = make_event(total_seats=1)
+        waiting = User.objects.create_user('waiting')
+        # an earlier booking of the waiting user, checked in and then cancelled
+        old = Ticket.objects.create(event=event, user=waiting, status='CANCELLED', checked_in_at=timezone.now())
+        ticket = reserve_seat(event.pk, self.user)
+        WaitlistEntry.objects.create(event=event, user=waiting)
+
+        self.assertTrue(ticket.cancel())
+        old.refresh_from_db()
+        self.assertEqual(old.status, 'BOOKED')
+        self.assertIsNone(old.checked_in_at)
+        self.assertEqual(checkin.scan(event.pk, qr_payload(old))['result'], 'checked_in')
+
+    def test_sold_out_event_reopens_when_a_seat_is_released(self):
+        event = make_event(total_seats=1)
+        ticket = reserve_seat(event.pk, self.user)
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.sold_out), ('CLOSED', True))
+
+        self.assertTrue(ticket.cancel())
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.sold_out, event.booked_count), ('OPEN', False, 0))
+
+    def test_event_closed_by_hand_stays_closed_after_cancel(self):
+        event = make_event(total_seats=1)
+        ticket = reserve_seat(event.pk, self.user)
+        WaitlistEntry.objects.create(event=event, user=User.objects.create_user('waiting'))
+        # the organizer reopens the sold-out event and closes it again
+        event = Event.objects.get(pk=event.pk)
+        for status in ('OPEN', 'CLOSED'):
+            event.status = status
+            event.save(update_fields=['status'])
+
+        self.assertTrue(ticket.cancel())
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.sold_out, event.booked_count), ('CLOSED', False, 0))
+        self.assertEqual(WaitlistEntry.objects.filter(event=event).count(), 1)
+        self.assertFalse(Ticket.objects.filter(event=event, status='BOOKED').exists())
+
+    def test_checked_in_ticket_cannot_be_cancelled(self):
+        event = make_event()
+        ticket = reserve_seat(event.pk, self.user)
+        self.assertEqual(checkin.scan(event.pk, qr_payload(ticket))['result'], 'checked_in')
+
+        response = self.client.post(reverse('ticket_cancel', args=[ticket.pk]), follow=True)
+        self.assertContains(response, "can no longer be cancelled")
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.status, 'BOOKED')
+        self.assertFalse(Ticket.objects.get(pk=ticket.pk).cancel())
+        self.assertEqual(Event.objects.get(pk=event.pk).booked_count, 1)
+
+
+class SeatStateAssertions:
+    def assertSeatsConsistent(self, event):
+        # the stored counter and bitmap always match the BOOKED tickets
+        event.refresh_from_db()
+        booked = Ticket.objects.filter(event=event, status='BOOKED')
+        self.assertEqual(event.booked_count, booked.count())
+        seats = sorted(booked.exclude(seat=None).values_list('seat', flat=True))
+        self.assertEqual(sorted(seatmap.booked_labels(bytes(event.seat_bitmap), event.total_seats)), seats)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ReserveSeatTests(SeatStateAssertions, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(f'student{i}') for i in range(4)]
+
+    def test_last_seat_closes_the_event_and_nobody_oversells(self):
+        event = make_event(total_seats=2)
+        reserve_seat(event.pk, self.users[0], 'A1')
+        reserve_seat(event.pk, self.users[1])
+
+        with self.assertRaises(EventFull):
+            reserve_seat(event.pk, self.users[2], 'B1')
+        self.assertSeatsConsistent(event)
+        self.assertEqual((event.booked_count, event.status, event.sold_out), (2, 'CLOSED', True))
+
+    def test_seat_taken_by_another_user_rolls_back_the_capacity_claim(self):
+        event = make_event(total_seats=3)
+        reserve_seat(event.pk, self.users[0], 'A1')
+
+        with self.assertRaises(SeatTaken):
+            reserve_seat(event.pk, self.users[1], 'a1 ')
+        self.assertSeatsConsistent(event)
+        self.assertEqual((event.booked_count, event.status), (1, 'OPEN'))
+        self.assertFalse(Ticket.objects.filter(event=event, user=self.users[1]).exists())
+
+    def test_seat_held_by_another_user_is_refused(self):
+        event = make_event(total_seats=3)
+        hold_seat(event.pk, self.users[0], 'A1')
+
+        with self.assertRaises(SeatHeld):
+            reserve_seat(event.pk, self.users[1], 'A1')
+        reserve_seat(event.pk, self.users[0], 'A1')
+        self.assertSeatsConsistent(event)
+        self.assertEqual(event.booked_count, 1)
+
+    def test_second_booking_by_the_same_user_is_refused(self):
+        event = make_event(total_seats=3)
+        reserve_seat(event.pk, self.users[0], 'A1')
+
+        with self.assertRaises(AlreadyRegistered):
+            reserve_seat(event.pk, self.users[0], 'B1')
+        with self.assertRaises(InvalidSeat):
+            reserve_seat(event.pk, self.users[1], 'Z99')
+        self.assertSeatsConsistent(event)
+        self.assertEqual(event.booked_count, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class WaitlistTests(SeatStateAssertions, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.booked = [User.objects.create_user(f'booked{i}') for i in range(2)]
+        self.waiting = [User.objects.create_user(f'waiting{i}') for i in range(3)]
+        self.event = make_event(total_seats=2)
+        self.tickets = [reserve_seat(self.event.pk, user, seat) for user, seat in zip(self.booked, ['A1', 'B1'])]
+        for user in self.waiting:
+            join_waitlist(self.event.pk, user)
+
+    def ticket(self, user):
+        return Ticket.objects.get(event=self.event, user=user)
+
+    def test_released_seats_go_to_the_waitlist_in_join_order(self):
+        self.assertEqual([waitlist_position(self.event.pk, u) for u in self.waiting], [1, 2, 3])
+
+        self.assertTrue(self.tickets[1].cancel())
+        self.assertEqual((self.ticket(self.waiting[0]).status, self.ticket(self.waiting[0]).seat), ('BOOKED', 'B1'))
+        self.assertSeatsConsistent(self.event)
+        self.assertEqual((self.event.booked_count, self.event.status), (2, 'CLOSED'))
+        self.assertEqual([waitlist_position(self.event.pk, u) for u in self.waiting], [None, 1, 2])
+
+        self.assertTrue(self.tickets[0].cancel())
+        self.assertEqual(self.ticket(self.waiting[1]).seat, 'A1')
+        self.assertSeatsConsistent(self.event)
+        self.assertEqual(self.event.booked_count, 2)
+
+    def test_cancelling_with_an_empty_waitlist_releases_the_seat(self):
+        for ticket in self.tickets:
+            ticket.cancel()
+        self.assertTrue(self.ticket(self.waiting[0]).cancel())
+        self.assertEqual(self.ticket(self.waiting[2]).seat, 'A1')
+        # nobody is left waiting to take the next two seats
+        self.assertTrue(self.ticket(self.waiting[1]).cancel())
+        self.assertTrue(self.ticket(self.waiting[2]).cancel())
+
+        self.assertSeatsConsistent(self.event)
+        self.assertEqual((self.event.booked_count, self.event.status, self.event.sold_out), (0, 'OPEN', False))
+        self.assertFalse(WaitlistEntry.objects.filter(event=self.event).exists())
+
+    def test_joining_needs_a_full_event_and_no_ticket(self):
+        with self.assertRaises(AlreadyRegistered):
+            join_waitlist(self.event.pk, self.booked[0])
+        for ticket in self.tickets:
+            ticket.cancel()
+        for user in self.waiting[:2]:
+            self.ticket(user).cancel()
+        with self.assertRaises(SeatsAvailable):
+            join_waitlist(self.event.pk, self.booked[0])
+        self.assertIsNone(waitlist_position(self.event.pk, self.booked[0]))
+
+
+@override_settings(CACHES=LOCMEM_CACHE, ADMISSION_RATE=1, ADMISSION_WINDOW=60)
+class AdmissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('student')
+        self.client.force_login(self.user)
+        self.event = make_event(waiting_room=True)
+
+    def register_with_token(self, joined_at):
+        token = admission.join_queue(self.event.pk, self.user, now=joined_at)
+        self.client.cookies[admission.cookie_name(self.event.pk)] = token
+        return self.client.post(reverse('event_register', args=[self.event.pk]), {'seat': 'A1'}, follow=True)
+
+    def assertNotAdmitted(self, response):
+        self.assertContains(response, NotAdmitted.message)
+        self.assertFalse(Ticket.objects.filter(event=self.event).exists())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.booked_count, 0)
+
+    def test_registration_without_a_token_is_refused(self):
+        with self.assertRaises(NotAdmitted):
+            reserve_seat(self.event.pk, self.user)
+        with self.assertRaises(NotAdmitted):
+            hold_seat(self.event.pk, self.user, 'A1')
+        self.assertNotAdmitted(self.client.post(reverse('event_register', args=[self.event.pk]), follow=True))
+
+    def test_registration_before_the_admission_time_is_refused(self):
+        # admitted one second after joining, at ADMISSION_RATE=1
+        self.assertNotAdmitted(self.register_with_token(time.time() + 30))
+
+    def test_registration_after_the_window_is_refused(self):
+        self.assertNotAdmitted(self.register_with_token(time.time() - 120))
+
+    def test_registration_within_the_window_is_accepted(self):
+        response = self.register_with_token(time.time() - 30)
+        self.assertRedirects(response, reverse('my_events'))
+        self.assertEqual(Ticket.objects.get(event=self.event).seat, 'A1')
+
+    def test_queue_spaces_admissions_by_the_rate(self):
+        now = time.time()
+        other = User.objects.create_user('other')
+        first = admission.read_token(admission.join_queue(self.event.pk, self.user, now=now), self.event.pk)
+        second = admission.read_token(admission.join_queue(self.event.pk, other, now=now), self.event.pk)
+        self.assertEqual((first['p'], second['p']), (1, 2))
+        self.assertAlmostEqual(second['a'] - first['a'], 1.0, places=2)
+        status = admission.queue_status(second, now=now + 0.5)
+        self.assertEqual((status['admitted'], status['ahead']), (False, 1))
+        self.assertTrue(admission.queue_status(second, now=now + 1.5)['admitted'])
+        self.assertTrue(admission.queue_status(second, now=now + 62)['expired'])
+
+
+class CheckinTests(TestCase):
+    def test_ticket_scanned_by_two_processes_gets_in_once(self):
+        event = make_event()
+        ticket = reserve_seat(event.pk, User.objects.create_user('student'))
+        # one EventCheckin per worker process, both loaded before either scan
+        doors = [checkin.EventCheckin(event.pk), checkin.EventCheckin(event.pk)]
+        for door in doors:
+            door._load()
+
+        results = [door.scan(ticket.pk)['result'] for door in doors]
+        self.assertEqual(results, ['checked_in', 'duplicate'])
+        self.assertIsNotNone(Ticket.objects.get(pk=ticket.pk).checked_in_at)
+        # each door now rejects it from memory
+        with self.assertNumQueries(0):
+            self.assertEqual([door.scan(ticket.pk)['result'] for door in doors], ['duplicate', 'duplicate'])
+
+
+class ManifestTests(TestCase):
+    def setUp(self):
+        self.event = make_event()
+        self.users = [User.objects.create_user(f'student{i}') for i in range(4)]
+
+    def export(self, since=0):
+        version, is_delta, chunks = manifest.export_manifest(self.event.pk, since, chunk_size=2)
+        return version, b''.join(chunks)
+
+    def test_delta_applied_to_the_old_manifest_gives_the_new_one(self):
+        tickets = [reserve_seat(self.event.pk, user, seat) for user, seat in zip(self.users, ['A1', 'B1', None])]
+        v1, full_v1 = self.export()
+        self.assertEqual(manifest.read_manifest(full_v1).records, 3)
+
+        tickets[0].cancel()
+        new = reserve_seat(self.event.pk, self.users[3], 'C1')
+        v2, delta = self.export(since=v1)
+        _, full_v2 = self.export()
+
+        self.assertGreater(v2, v1)
+        header = manifest.read_manifest(delta)
+        self.assertEqual((header.kind, header.base, header.version), (manifest.DELTA, v1, v2))
+        start = manifest.HEADER.size + header.records * manifest.RECORD.size
+        removed = [ticket_id for (ticket_id,) in
+                   manifest.REMOVED.iter_unpack(delta[start:start + header.removed * manifest.REMOVED.size])]
+        self.assertEqual(removed, [tickets[0].pk])
+        self.assertEqual(manifest.apply_delta(full_v1, delta), full_v2)
+
+        self.assertIsNone(manifest.lookup(full_v2, tickets[0].pk))
+        self.assertEqual(manifest.lookup(full_v2, new.pk), (ticket_signature(self.event.pk, new.pk), 'C1'))
+        self.assertIsNone(manifest.lookup(full_v2, tickets[2].pk)[1])
+
+    def test_delta_from_the_current_version_is_empty(self):
+        reserve_seat(self.event.pk, self.users[0], 'A1')
+        version, full = self.export()
+        _, delta = self.export(since=version)
+        header = manifest.read_manifest(delta)
+        self.assertEqual((header.records, header.removed), (0, 0))
+        self.assertEqual(manifest.apply_delta(full, delta), full)
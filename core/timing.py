@@ -0,0 +1,123 @@
+"""Opt-in per-request instrumentation: SQL, template and total request time.
+
+With REQUEST_TIMING enabled, `RequestTimingMiddleware` times every SQL
+statement (through a connection execute wrapper) and every top-level
+template render (through the `TimedDjangoTemplates` backend), adds the
+totals to the response as a ``Server-Timing`` header, and logs requests
+slower than REQUEST_TIMING_SLOW_MS, with their slowest statements, as one
+JSON line to the ``core.slow_requests`` logger (a rotating file, see
+LOGGING in settings). With it disabled the middleware removes itself at
+startup and the template backend only checks a context variable.
+"""
+import heapq
+import json
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger('core.slow_requests')
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Totals for one request; keeps only the `keep` slowest statements."""
+
+    def __init__(self, keep=5):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.keep = keep
+        self._slowest = []  # min-heap of (ms, sequence, sql)
+
+    def add_query(self, sql, ms):
+        self.queries += 1
+        self.sql_ms += ms
+        if self.keep:
+            item = (ms, self.queries, sql)
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, item)
+            else:
+                heapq.heappushpop(self._slowest, item)
+
+    def slowest(self):
+        return [{'ms': round(ms, 2), 'sql': sql[:1000]} for ms, _, sql in sorted(self._slowest, reverse=True)]
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add_query(sql, (time.perf_counter() - started) * 1000)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render time added to the current request's timings."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class RequestTimingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'REQUEST_TIMING_SLOW_MS', 500)
+        self.keep = getattr(settings, 'REQUEST_TIMING_SLOW_QUERIES', 5)
+
+    def __call__(self, request):
+        timings = RequestTimings(self.keep)
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        response['Server-Timing'] = ', '.join([
+            f'sql;dur={timings.sql_ms:.1f};desc="{timings.queries} queries"',
+            f'tpl;dur={timings.template_ms:.1f}',
+            f'total;dur={total_ms:.1f};desc="request"',
+        ])
+        if total_ms >= self.slow_ms:
+            user = getattr(request, 'user', None)
+            logger.warning(json.dumps({
+                'ts': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'user': user.pk if user is not None and user.is_authenticated else None,
+                'total_ms': round(total_ms, 1),
+                'sql_ms': round(timings.sql_ms, 1),
+                'template_ms': round(timings.template_ms, 1),
+                'queries': timings.queries,
+                'slowest': timings.slowest(),
+            }))
+        return response
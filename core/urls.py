@@ -6,13 +6,25 @@ urlpatterns = [
 
     # Events
     path('events/', views.event_list, name='event_list'),
+    path('events/search/', views.event_search, name='event_search'),
     path('events/<int:pk>/', views.event_detail, name='event_detail'),
+    path('events/<int:pk>/seats/', views.event_seats, name='event_seats'),
+    path('events/<int:pk>/hold/', views.seat_hold, name='seat_hold'),
     path('events/create/', views.event_create, name='event_create'),
     path('events/<int:pk>/edit/', views.event_update, name='event_update'),
     path('events/<int:pk>/register/', views.event_register, name='event_register'),
     path('events/<int:pk>/register/', views.event_register, name='event_register'),
+    path('events/<int:pk>/queue/', views.event_queue, name='event_queue'),
+    path('events/<int:pk>/queue/status/', views.event_queue_status, name='event_queue_status'),
+    path('events/<int:pk>/waitlist/', views.event_waitlist, name='event_waitlist'),
+    path('tickets/<int:pk>/cancel/', views.ticket_cancel, name='ticket_cancel'),
+    path('events/<int:pk>/checkin/', views.event_checkin, name='event_checkin'),
+    path('events/<int:pk>/manifest/', views.event_manifest, name='event_manifest'),
+    path('tickets/<int:pk>/qr.png', views.ticket_qr, name='ticket_qr'),
     path('my-events/', views.my_events, name='my_events'),
     path('my-activities/', views.my_events, name='my_activities'),
+    path('my-activities/history/', views.my_history, name='my_history'),
+    path('events/archive/', views.event_archive, name='event_archive'),
 
     # Auditorium bookings
     path('auditorium/book/', views.booking_create, name='booking_create'),
@@ -1,51 +1,35 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.contrib.auth import login
 from django.utils import timezone
 from django.db import IntegrityError
-from io import BytesIO
-from PIL import Image
-from django.core.files.base import ContentFile
-import qrcode
-
-from .models import Event, Ticket, AuditoriumBooking, Profile
+from django.db.models import Case, F, Q, When
+from django.core.paginator import Paginator
+import base64
+import zlib
+from datetime import date
+from urllib.parse import urlencode
+
+from .models import Event, Ticket, AuditoriumBooking, Profile, ArchivedEvent, ArchivedTicket, ArchivedBooking
+from . import admission, checkin, manifest, search, seatmap
+from .qr import PAYLOAD_VERSION, ticket_qr_png
+from .auth import get_role
+from .db import serialize_writes
+from .listings import cached_cards, cached_departments, event_card, invalidate_listings
+from .conflicts import find_conflict
 from .forms import EventForm, AuditoriumBookingForm, SignUpForm
+from .registration import reserve_seat, RegistrationError, EventFull, AlreadyRegistered, InvalidSeat, NotAdmitted
+from .holds import active_holds, hold_seat, hold_ttl, release_hold, seat_holds
+from .waitlist import join_waitlist, leave_waitlist, waitlist_position
 
-# Helper checks
+# Helper checks (the role is resolved once per request, see core.auth)
 def is_organizer(user):
-    try:
-        return user.profile.role == 'organizer' or user.is_staff
-    except Profile.DoesNotExist:
-        return False
+    return user.is_staff or get_role(user) == 'organizer'
 
 def is_auditorium_manager(user):
-    try:
-        return user.profile.role == 'auditorium_manager' or user.is_staff
-    except Profile.DoesNotExist:
-        return False
-
-
-def generate_qr_code(ticket):
-    """Generate a QR code image for a ticket and save it."""
-    try:
-        # QR code data: event ID + ticket ID + user username
-        qr_data = f"Event:{ticket.event.id}|Ticket:{ticket.id}|User:{ticket.user.username}"
-        qr = qrcode.QRCode(version=1, box_size=10, border=2)
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save image to BytesIO buffer
-        img_io = BytesIO()
-        img.save(img_io, format='PNG')
-        img_io.seek(0)
-        
-        # Save to ticket model
-        filename = f'ticket_{ticket.id}_qr.png'
-        ticket.qr_code.save(filename, ContentFile(img_io.getvalue()), save=True)
-    except Exception as e:
-        print(f"Error generating QR code: {e}")
+    return user.is_staff or get_role(user) == 'auditorium_manager'
 
 
 def home(request):
@@ -53,31 +37,181 @@ def home(request):
     if not request.user.is_authenticated:
         return redirect('login')
 
-    events = Event.objects.filter(event_date__gte=timezone.now().date()).order_by('event_date')[:5]
+    today = timezone.now().date()
+    events = cached_cards(f'home:{today}', Event.objects.filter(event_date__gte=today).order_by('event_date')[:5])
     return render(request, 'core/home.html', {'events': events})
 
 
+EVENT_LIST_PAGE_SIZE = 24
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_cursor(value):
+    # cursors are "<event_date>_<pk>" of the last (or first) card on a page
+    day, _, pk = (value or '').partition('_')
+    day = _parse_date(day)
+    return (day, int(pk)) if day and pk.isdigit() else None
+
+
 def event_list(request):
     # Only show OPEN events (approved by admin); hide PENDING requests
-    events = Event.objects.filter(status='OPEN').order_by('event_date')
-    return render(request, 'core/event_list.html', {'events': events})
+    q = request.GET.get('q', '').strip()[:100]
+    department = request.GET.get('department', '').strip()
+    date_from = _parse_date(request.GET.get('from'))
+    date_to = _parse_date(request.GET.get('to'))
+    after = _parse_cursor(request.GET.get('after'))
+    before = None if after else _parse_cursor(request.GET.get('before'))
+
+    events = Event.objects.filter(status='OPEN')
+    if q:
+        # full-text match on title/description/department/venue (core.search)
+        matches = search.matching_ids(q)
+        events = events.filter(pk__in=matches) if matches is not None else events.none()
+    if department:
+        events = events.filter(department=department)
+    if date_from:
+        events = events.filter(event_date__gte=date_from)
+    if date_to:
+        events = events.filter(event_date__lte=date_to)
+
+    # keyset pagination on (event_date, id): each page is one indexed range read,
+    # however deep it is, and links stay stable while events are added
+    if before:
+        events = events.filter(Q(event_date__lt=before[0]) | Q(event_date=before[0], pk__lt=before[1]))
+        events = events.order_by('-event_date', '-pk')
+    else:
+        if after:
+            events = events.filter(Q(event_date__gt=after[0]) | Q(event_date=after[0], pk__gt=after[1]))
+        events = events.order_by('event_date', 'pk')
+
+    filters = {k: v for k, v in (('q', q), ('department', department),
+                                 ('from', date_from and date_from.isoformat()),
+                                 ('to', date_to and date_to.isoformat())) if v}
+    cursor = {'after': after} if after else {'before': before} if before else {}
+    cards = cached_cards('event_list', events[:EVENT_LIST_PAGE_SIZE + 1],
+                         {**filters, **{k: f'{v[0].isoformat()}_{v[1]}' for k, v in cursor.items()}})
+
+    more = len(cards) > EVENT_LIST_PAGE_SIZE
+    cards = cards[:EVENT_LIST_PAGE_SIZE]
+    if before:
+        cards.reverse()
+    has_next = more if not before else True
+    has_prev = bool(after) or (bool(before) and more)
+    query = urlencode(filters)
+    prefix = f'?{query}&' if query else '?'
+    return render(request, 'core/event_list.html', {
+        'events': cards,
+        'q': q, 'department': department, 'date_from': date_from, 'date_to': date_to,
+        'departments': cached_departments(),
+        'next_url': f"{prefix}after={cards[-1]['event_date'].isoformat()}_{cards[-1]['pk']}" if cards and has_next else None,
+        'prev_url': f"{prefix}before={cards[0]['event_date'].isoformat()}_{cards[0]['pk']}" if cards and has_prev else None,
+    })
+
+
+SEARCH_RESULTS_LIMIT = 50
+
+
+def event_search(request):
+    # ranked full-text search with per-department result counts
+    q = request.GET.get('q', '').strip()[:100]
+    department = request.GET.get('department', '').strip()
+    events, facets = search.search_events(q, department or None, limit=SEARCH_RESULTS_LIMIT)
+    return render(request, 'core/event_search.html', {
+        'q': q,
+        'department': department,
+        'events': [event_card(ev) for ev in events],
+        'facets': facets,
+        'total': sum(count for _, count in facets),
+    })
 
 
 def event_detail(request, pk):
-    # Only allow viewing OPEN events; PENDING requests are not visible to students
-    event = get_object_or_404(Event, pk=pk, status='OPEN')
+    # PENDING requests are not visible to students; full (CLOSED) events are, for their waitlist
+    event = get_object_or_404(Event.objects.exclude(status='PENDING'), pk=pk)
     ticket = None
+    held_seats = []
+    my_hold = None
+    queue = None
+    waiting = False
+    position = None
     if request.user.is_authenticated:
-        ticket = Ticket.objects.filter(event=event, user=request.user).first()
-    # collect booked seats to render a seat map client-side
-    booked_seats = list(Ticket.objects.filter(event=event, status='BOOKED').values_list('seat', flat=True))
+        ticket = Ticket.objects.filter(event=event, user=request.user, status='BOOKED').first()
+        if ticket is None and event.sold_out and event.available_seats() == 0:
+            position = waitlist_position(event.pk, request.user)
+        elif ticket is None and event.status == 'OPEN':
+            if event.waiting_room:
+                # the seat map is only shown once the queue has let the user in
+                token = admission.request_token(request, event.pk)
+                queue = admission.queue_status(token) if token else None
+                waiting = not (queue and queue['admitted'])
+            if not waiting:
+                # the user's own hold is preselected, not shown as taken
+                held_seats, my_hold = seat_holds(event.pk, request.user)
+    # the seat map is drawn client-side from the stored occupancy bitmap and the held seats
     return render(request, 'core/event_detail.html', {
         'event': event,
         'ticket': ticket,
-        'booked_seats': booked_seats,
+        'seat_bitmap': _seat_bitmap_b64(event.seat_bitmap, event.total_seats),
+        'held_seats': held_seats,
+        'my_hold': my_hold,
+        'hold_ttl': int(hold_ttl().total_seconds()),
+        'queue': queue,
+        'waiting': waiting,
+        'waitlist_position': position,
     })
 
 
+def _seat_bitmap_b64(bitmap, total_seats):
+    # pad legacy/empty bitmaps so clients always get one bit per seat
+    bitmap = bytes(bitmap or b'').ljust(len(seatmap.empty(total_seats)), b'\0')
+    return base64.b64encode(bitmap).decode('ascii')
+
+
+def event_seats(request, pk):
+    """Seat occupancy for the seat map, polled by `event_detail`.
+
+    Returns JSON with the base64 bitmap (see `core.seatmap` for the layout)
+    and the labels of held seats (see `core.holds`), or the raw bitmap bytes
+    with `?format=bin`. Responds 304 when the client's ETag is still current,
+    so polling an unchanged event costs two small indexed SELECTs.
+    """
+    row = (Event.objects.filter(pk=pk).exclude(status='PENDING')
+           .values('total_seats', 'booked_count', 'seat_bitmap', 'status').first())
+    if row is None:
+        raise Http404("No such event.")
+    bitmap = bytes(row['seat_bitmap'] or b'')
+    held = active_holds(pk) if row['status'] == 'OPEN' else []
+    held_crc = zlib.crc32(','.join(held).encode())
+    etag = f'"{row["booked_count"]}-{row["total_seats"]}-{zlib.crc32(bitmap):08x}-{held_crc:08x}-{row["status"]}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    elif request.GET.get('format') == 'bin':
+        response = HttpResponse(bitmap.ljust(len(seatmap.empty(row['total_seats'])), b'\0'),
+                                content_type='application/octet-stream')
+        response['X-Total-Seats'] = str(row['total_seats'])
+    else:
+        response = JsonResponse({
+            'status': row['status'],
+            'total_seats': row['total_seats'],
+            'rows': seatmap.ROWS,
+            'cols': seatmap.columns(row['total_seats']),
+            'booked': row['booked_count'],
+            'available': max(row['total_seats'] - row['booked_count'], 0),
+            'bitmap': _seat_bitmap_b64(bitmap, row['total_seats']),
+            # seats picked by someone within SEAT_HOLD_TTL (including the caller's own)
+            'held': held,
+        })
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
 @login_required
 @user_passes_test(is_organizer)
 def event_create(request):
@@ -114,54 +248,197 @@ def event_update(request, pk):
 
 
 @login_required
-def event_register(request, pk):
-    event = get_object_or_404(Event, pk=pk, status='OPEN')
-
-    if event.available_seats() <= 0:
-        event.status = 'CLOSED'
-        event.save()
-        messages.error(request, "No seats available.")
-        return redirect('event_detail', pk=pk)
+@serialize_writes
+def seat_hold(request, pk):
+    """Hold the seat picked on the seat map for SEAT_HOLD_TTL seconds (POST `seat`; empty releases)."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required.'}, status=405)
+    seat = request.POST.get('seat', '')
+    if not seat.strip():
+        release_hold(pk, request.user)
+        return JsonResponse({'seat': None})
+    try:
+        expires_at = hold_seat(pk, request.user, seat, admitted=admission.is_admitted(request, pk))
+    except EventFull as exc:
+        return JsonResponse({'error': exc.message}, status=404)
+    except NotAdmitted as exc:
+        return JsonResponse({'error': exc.message}, status=403)
+    except InvalidSeat as exc:
+        return JsonResponse({'error': exc.message}, status=400)
+    except RegistrationError as exc:
+        # SeatTaken / SeatHeld / AlreadyRegistered
+        return JsonResponse({'error': exc.message}, status=409)
+    return JsonResponse({'seat': seat.strip().upper(), 'expires_at': expires_at.isoformat(),
+                         'ttl': int(hold_ttl().total_seconds())})
 
-    existing = Ticket.objects.filter(event=event, user=request.user, status='BOOKED').first()
-    if existing:
-        messages.info(request, "You are already registered for this event.")
-        return redirect('event_detail', pk=pk)
 
+@login_required
+@serialize_writes
+def event_register(request, pk):
     # assign seat from POST if provided
     seat = request.POST.get('seat') if request.method == 'POST' else None
-    # check seat uniqueness
-    if seat:
-        if Ticket.objects.filter(event=event, seat=seat, status='BOOKED').exists():
-            messages.error(request, 'Selected seat is already taken. Choose a different seat.')
-            return redirect('event_detail', pk=pk)
+    # waiting-room events only take users the queue has let in (core.admission)
+    admitted = admission.is_admitted(request, pk)
 
-    Ticket.objects.create(event=event, user=request.user, status='BOOKED', seat=seat)
-    ticket = Ticket.objects.get(event=event, user=request.user, status='BOOKED')
-    
-    # Generate and save QR code for the ticket
-    generate_qr_code(ticket)
-    
-    if event.available_seats() <= 0:
-        event.status = 'CLOSED'
-        event.save()
+    try:
+        ticket = reserve_seat(pk, request.user, seat, admitted=admitted)
+    except EventFull as exc:
+        # either closed (a full one offers its waitlist on the detail page) or
+        # OPEN with no capacity left, e.g. after total_seats was lowered; close
+        # that so it drops off the listing
+        get_object_or_404(Event.objects.exclude(status='PENDING'), pk=pk)
+        if Event.objects.filter(pk=pk, status='OPEN', booked_count__gte=F('total_seats')).update(
+                status='CLOSED', sold_out=True):
+            invalidate_listings()
+        messages.error(request, exc.message)
+        return redirect('event_detail', pk=pk)
+    except AlreadyRegistered as exc:
+        messages.info(request, exc.message)
+        return redirect('event_detail', pk=pk)
+    except RegistrationError as exc:
+        messages.error(request, exc.message)
+        return redirect('event_detail', pk=pk)
 
+    # the QR image is rendered lazily by `ticket_qr` when first shown
     messages.success(request, "Registration successful.")
+    response = redirect('my_events')
+    if admitted:
+        admission.clear_cookie(response, pk)
+    return response
+
+
+@login_required
+@serialize_writes
+def event_waitlist(request, pk):
+    """Join (POST) or, with ``action=leave``, leave the waitlist of a full event."""
+    get_object_or_404(Event.objects.exclude(status='PENDING'), pk=pk)
+    if request.method == 'POST':
+        if request.POST.get('action') == 'leave':
+            leave_waitlist(pk, request.user)
+            messages.info(request, "You have left the waitlist.")
+        else:
+            try:
+                position = join_waitlist(pk, request.user)
+            except RegistrationError as exc:
+                messages.info(request, exc.message)
+            else:
+                messages.success(request, f"You are number {position} on the waitlist. "
+                                          "If a seat is released it will be booked for you automatically.")
+    return redirect('event_detail', pk=pk)
+
+
+@login_required
+@serialize_writes
+def ticket_cancel(request, pk):
+    """Cancel one of the user's tickets (POST); the seat goes to the head of the waitlist, if any."""
+    ticket = get_object_or_404(Ticket, pk=pk, user=request.user)
+    if request.method == 'POST' and ticket.checked_in_at:
+        messages.error(request, "This ticket has been checked in at the door and can no longer be cancelled.")
+    elif request.method == 'POST' and ticket.cancel():
+        messages.success(request, "Your registration has been cancelled.")
     return redirect('my_events')
 
 
+@login_required
+@serialize_writes
+def event_queue(request, pk):
+    """Join a waiting-room event's queue (POST); the position token is kept in a cookie."""
+    waiting_room = Event.objects.filter(pk=pk, status='OPEN').values_list('waiting_room', flat=True).first()
+    if waiting_room is None:
+        raise Http404("No such event.")
+    response = redirect('event_detail', pk=pk)
+    if request.method != 'POST' or not waiting_room:
+        return response
+    # joining again keeps the place, until the turn has been missed
+    token = admission.request_token(request, pk)
+    if token is None or admission.queue_status(token)['expired']:
+        admission.set_cookie(response, pk, admission.join_queue(pk, request.user))
+    return response
+
+
+def event_queue_status(request, pk):
+    """The caller's place in an event's queue, as JSON; polled by `event_detail`.
+
+    Answered from the signed queue cookie alone (see `core.admission`), so
+    polling never queries the database, however many students are waiting.
+    """
+    token = admission.read_token(request.COOKIES.get(admission.cookie_name(pk)), pk)
+    if token is None:
+        return JsonResponse({'error': 'Not in the queue.'}, status=404)
+    response = JsonResponse(admission.queue_status(token))
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+@login_required
+def ticket_qr(request, pk):
+    """Serve a ticket's QR code PNG, rendering and storing it on first request."""
+    ticket = get_object_or_404(Ticket, pk=pk)
+    if ticket.user_id != request.user.id and not request.user.is_staff:
+        raise Http404("No such ticket.")
+
+    # the payload never changes for a ticket (within a payload version), so browsers can keep the image
+    etag = f'"ticket-qr-v{PAYLOAD_VERSION}-{ticket.pk}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    else:
+        png = ticket_qr_png(ticket)
+        if png is None:
+            response = HttpResponse("QR code temporarily unavailable.", status=503, content_type='text/plain')
+            response['Retry-After'] = '5'
+            return response
+        response = HttpResponse(png, content_type='image/png')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=86400'
+    return response
+
+
+@login_required
+@user_passes_test(is_organizer)
+@serialize_writes
+def event_checkin(request, pk):
+    """Door check-in: the scanner page (GET) and its JSON API (POST the QR payload as `code`).
+
+    `core.checkin` checks scans against memory; an admitted ticket costs one
+    conditional UPDATE past the session and user lookups.
+    """
+    if request.method == 'POST':
+        return JsonResponse(checkin.scan(pk, request.POST.get('code', '')))
+    event = get_object_or_404(Event.objects.exclude(status='PENDING'), pk=pk)
+    return render(request, 'core/event_checkin.html', {'event': event, 'counts': checkin.event_checkin(pk).counts()})
+
+
+@login_required
+@user_passes_test(is_organizer)
+def event_manifest(request, pk):
+    """Offline door-scanner manifest of the event's booked tickets (format in `core.manifest`).
+
+    ``?since=<version>`` sends only the changes after the manifest the
+    scanner already has; the new version is in the X-Manifest-Version header.
+    """
+    if not Event.objects.exclude(status='PENDING').filter(pk=pk).exists():
+        raise Http404("No such event.")
+    try:
+        since = max(int(request.GET.get('since') or 0), 0)
+    except ValueError:
+        since = 0
+    version, delta, chunks = manifest.export_manifest(pk, since)
+    name = f"event-{pk}-v{since}-to-v{version}.tkm" if delta else f"event-{pk}-v{version}.tkm"
+    response = StreamingHttpResponse(chunks, content_type='application/octet-stream')
+    response['X-Manifest-Version'] = str(version)
+    response['Content-Disposition'] = f'attachment; filename="{name}"'
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
+
 @login_required
 def my_events(request):
     tickets = Ticket.objects.filter(user=request.user, status='BOOKED').select_related('event').order_by('-booked_at')
     from django.conf import settings
     auditorium_capacity = getattr(settings, 'AUDITORIUM_CAPACITY', 500)
 
-    bookings = AuditoriumBooking.objects.filter(requested_by=request.user).order_by('-created_at')
-    # attach linked event info (if an Event was created from the booking)
-    for b in bookings:
-        ev = Event.objects.filter(title=b.purpose, event_date=b.event_date,
-                                  start_time=b.start_time, end_time=b.end_time, venue='Auditorium').first()
-        b.linked_event = ev
+    # linked event info (if an Event was created from the booking) comes in the same query
+    bookings = AuditoriumBooking.objects.filter(requested_by=request.user).select_related('event').order_by('-created_at')
     return render(request, 'core/my_events.html', {'tickets': tickets, 'bookings': bookings, 'auditorium_capacity': auditorium_capacity})
 
 
@@ -182,19 +459,10 @@ def booking_create(request):
             # also create a corresponding Event in PENDING state so organizers/users see it as a requested event
             title = booking.purpose or 'Auditorium Request'
             # check for existing events at the same venue/date/time (strict: prevent any overlaps at auditorium)
-            overlapping = Event.objects.filter(
-                event_date=booking.event_date,
-                venue='Auditorium'
-            )
-            has_conflict = False
-            for ev in overlapping:
-                # check time overlap
-                if not (booking.end_time <= ev.start_time or booking.start_time >= ev.end_time):
-                    has_conflict = True
-                    break
-            
+            has_conflict = find_conflict('Auditorium', booking.event_date, booking.start_time, booking.end_time) is not None
+
             if not has_conflict:
-                Event.objects.create(
+                booking.event = Event.objects.create(
                     title=title,
                     description=f"Requested auditorium event by {request.user.username}",
                     department=booking.department,
@@ -206,6 +474,7 @@ def booking_create(request):
                     status='PENDING',
                     created_by=request.user
                 )
+                booking.save(update_fields=['event'])
                 messages.success(request, "Auditorium booking request submitted.")
             else:
                 # reject the booking if auditorium is already booked at that time
@@ -235,48 +504,138 @@ def my_bookings(request):
     from django.conf import settings
     auditorium_capacity = getattr(settings, 'AUDITORIUM_CAPACITY', 500)
 
-    bookings = AuditoriumBooking.objects.filter(requested_by=request.user).order_by('-created_at')
-    for b in bookings:
-        ev = Event.objects.filter(title=b.purpose, event_date=b.event_date,
-                                  start_time=b.start_time, end_time=b.end_time, venue='Auditorium').first()
-        b.linked_event = ev
+    bookings = AuditoriumBooking.objects.filter(requested_by=request.user).select_related('event').order_by('-created_at')
     return render(request, 'core/my_bookings.html', {'bookings': bookings, 'auditorium_capacity': auditorium_capacity})
 
 
+# Read-only history of archived events (see core.archive); live views never touch these tables
+HISTORY_PAGE_SIZE = 50
+
+@login_required
+def my_history(request):
+    tickets = ArchivedTicket.objects.filter(user=request.user).select_related('event').order_by('-event__event_date', '-pk')
+    page = Paginator(tickets, HISTORY_PAGE_SIZE).get_page(request.GET.get('page'))
+    bookings = ArchivedBooking.objects.filter(requested_by=request.user).order_by('-event_date', '-pk')
+    return render(request, 'core/my_history.html', {'page': page, 'bookings': bookings})
+
+
+@login_required
+def event_archive(request):
+    events = ArchivedEvent.objects.order_by('-event_date', '-pk')
+    department = request.GET.get('department', '').strip()
+    if department:
+        events = events.filter(department=department)
+    page = Paginator(events, HISTORY_PAGE_SIZE).get_page(request.GET.get('page'))
+    return render(request, 'core/event_archive.html', {
+        'page': page, 'department': department,
+        'page_query': urlencode({'department': department}) + '&' if department else '',
+    })
+
+
+BOOKING_QUEUE_PAGE_SIZE = 50
+BOOKING_QUEUE_STATUSES = ['PENDING', 'APPROVED', 'REJECTED', 'ALL']
+
+
+def _booking_queue(request, department=None):
+    """Context for a paginated booking queue, filtered by the query string.
+
+    Shows PENDING requests unless ?status= says otherwise; `department`
+    pins the queue to one department (an organizer's own).
+    """
+    status = request.GET.get('status', 'PENDING').upper()
+    if status not in BOOKING_QUEUE_STATUSES:
+        status = 'PENDING'
+    dept_filter = department or request.GET.get('department', '').strip()
+    date_from = _parse_date(request.GET.get('from'))
+    date_to = _parse_date(request.GET.get('to'))
+
+    # requested_by is shown on every row, so fetch it in the same query
+    bookings = AuditoriumBooking.objects.select_related('requested_by')
+    if status == 'ALL':
+        # pending requests first, then the rest, newest first within each
+        bookings = bookings.order_by(Case(When(status='PENDING', then=0), default=1), '-created_at', '-pk')
+    else:
+        # walks booking_status_created_idx, however much history there is
+        bookings = bookings.filter(status=status).order_by('-created_at', '-pk')
+    if dept_filter:
+        bookings = bookings.filter(department=dept_filter)
+    if date_from:
+        bookings = bookings.filter(event_date__gte=date_from)
+    if date_to:
+        bookings = bookings.filter(event_date__lte=date_to)
+
+    filters = {k: v for k, v in (('status', status), ('department', '' if department else dept_filter),
+                                 ('from', date_from and date_from.isoformat()),
+                                 ('to', date_to and date_to.isoformat())) if v}
+    page = Paginator(bookings, BOOKING_QUEUE_PAGE_SIZE).get_page(request.GET.get('page'))
+    return {
+        'bookings': page.object_list,
+        'page': page,
+        'page_query': urlencode(filters) + '&',
+        'status': status,
+        'statuses': BOOKING_QUEUE_STATUSES,
+        'department': dept_filter,
+        'department_fixed': bool(department),
+        'date_from': date_from,
+        'date_to': date_to,
+    }
+
+
 @login_required
 @user_passes_test(is_auditorium_manager)
 def booking_list_admin(request):
-    bookings = AuditoriumBooking.objects.all().order_by('-created_at')
-    return render(request, 'core/booking_list.html', {'bookings': bookings})
+    return render(request, 'core/booking_list.html', _booking_queue(request))
 
 
 @login_required
 @user_passes_test(is_organizer)
 def booking_list_organizer(request):
     # Organizers see only bookings for their department (if department set on profile)
-    role = None
-    try:
-        role = request.user.profile.role
-    except Profile.DoesNotExist:
-        role = None
-
-    if request.user.is_staff:
-        bookings = AuditoriumBooking.objects.all().order_by('-created_at')
-    else:
+    dept = None
+    if not request.user.is_staff:
         # If organizer has department, filter by same department; otherwise show all
         dept = getattr(request.user.profile, 'department', None)
-        if dept:
-            bookings = AuditoriumBooking.objects.filter(department=dept).order_by('-created_at')
-        else:
-            bookings = AuditoriumBooking.objects.all().order_by('-created_at')
+    return render(request, 'core/booking_list_organizer.html', _booking_queue(request, department=dept))
 
-    return render(request, 'core/booking_list_organizer.html', {'bookings': bookings})
+
+def _approve_booking(request, booking):
+    """Open the booking's Event, or reject the booking if the slot is taken."""
+    from django.conf import settings
+    title = booking.purpose or 'Approved Auditorium Event'
+
+    # check for time conflicts with other approved events (not our own event)
+    has_conflict = find_conflict('Auditorium', booking.event_date, booking.start_time, booking.end_time,
+                                 statuses=['OPEN'], exclude_pk=booking.event_id) is not None
+
+    if has_conflict:
+        booking.status = 'REJECTED'
+        booking.remarks = 'Rejected: Auditorium already booked at this time.'
+        booking.save()
+        messages.error(request, f"Cannot approve: Auditorium is already booked during {booking.start_time} – {booking.end_time} on {booking.event_date}.")
+    elif booking.event:
+        # update the PENDING event created at request time
+        ev = booking.event
+        ev.status = 'OPEN'
+        ev.total_seats = getattr(settings, 'AUDITORIUM_CAPACITY', ev.total_seats or 500)
+        ev.save()
+    else:
+        booking.event = Event.objects.create(title=title,
+                                             description=f"Approved auditorium booking by {booking.requested_by.username}",
+                                             department=booking.department,
+                                             event_date=booking.event_date,
+                                             start_time=booking.start_time,
+                                             end_time=booking.end_time,
+                                             venue='Auditorium',
+                                             total_seats=getattr(settings, 'AUDITORIUM_CAPACITY', 500),
+                                             status='OPEN',
+                                             created_by=booking.requested_by)
+        booking.save(update_fields=['event'])
 
 
 @login_required
 @user_passes_test(is_organizer)
 def booking_update_status_organizer(request, pk):
-    booking = get_object_or_404(AuditoriumBooking, pk=pk)
+    booking = get_object_or_404(AuditoriumBooking.objects.select_related('event', 'requested_by'), pk=pk)
     if request.method == 'POST':
         status = request.POST.get('status')
         remarks = request.POST.get('remarks', '')
@@ -287,46 +646,7 @@ def booking_update_status_organizer(request, pk):
             messages.success(request, "Booking updated.")
         # if approved, ensure a corresponding Event is OPEN so it appears in upcoming events
         if status == 'APPROVED':
-            from django.conf import settings
-            title = booking.purpose or 'Approved Auditorium Event'
-            
-            # check for time conflicts with other approved events
-            overlapping = Event.objects.filter(
-                event_date=booking.event_date,
-                venue='Auditorium',
-                status='OPEN'  # only check against approved/open events
-            )
-            has_conflict = False
-            for ev in overlapping:
-                if not (booking.end_time <= ev.start_time or booking.start_time >= ev.end_time):
-                    has_conflict = True
-                    break
-            
-            if has_conflict:
-                booking.status = 'REJECTED'
-                booking.remarks = 'Rejected: Auditorium already booked at this time.'
-                booking.save()
-                messages.error(request, f"Cannot approve: Auditorium is already booked during {booking.start_time} – {booking.end_time} on {booking.event_date}.")
-            else:
-                # prefer updating an existing PENDING event created at request time
-                ev = Event.objects.filter(title=title, event_date=booking.event_date,
-                                          start_time=booking.start_time, end_time=booking.end_time,
-                                          venue='Auditorium').first()
-                if ev:
-                    ev.status = 'OPEN'
-                    ev.total_seats = getattr(settings, 'AUDITORIUM_CAPACITY', ev.total_seats or 500)
-                    ev.save()
-                else:
-                    Event.objects.create(title=title,
-                                         description=f"Approved auditorium booking by {booking.requested_by.username}",
-                                         department=booking.department,
-                                         event_date=booking.event_date,
-                                         start_time=booking.start_time,
-                                         end_time=booking.end_time,
-                                         venue='Auditorium',
-                                         total_seats=getattr(settings, 'AUDITORIUM_CAPACITY', 500),
-                                         status='OPEN',
-                                         created_by=booking.requested_by)
+            _approve_booking(request, booking)
         return redirect('booking_list_organizer')
     return render(request, 'core/booking_form.html', {'booking': booking, 'organizer_update': True})
 
@@ -354,7 +674,7 @@ def admin_user_delete(request, pk):
 @login_required
 @user_passes_test(is_auditorium_manager)
 def booking_update_status(request, pk):
-    booking = get_object_or_404(AuditoriumBooking, pk=pk)
+    booking = get_object_or_404(AuditoriumBooking.objects.select_related('event', 'requested_by'), pk=pk)
     if request.method == 'POST':
         status = request.POST.get('status')
         remarks = request.POST.get('remarks', '')
@@ -365,45 +685,7 @@ def booking_update_status(request, pk):
             messages.success(request, "Booking updated.")
         # if approved by admin, ensure event is opened
         if status == 'APPROVED':
-            from django.conf import settings
-            title = booking.purpose or 'Approved Auditorium Event'
-            
-            # check for time conflicts with other approved events
-            overlapping = Event.objects.filter(
-                event_date=booking.event_date,
-                venue='Auditorium',
-                status='OPEN'  # only check against approved/open events
-            )
-            has_conflict = False
-            for ev in overlapping:
-                if not (booking.end_time <= ev.start_time or booking.start_time >= ev.end_time):
-                    has_conflict = True
-                    break
-            
-            if has_conflict:
-                booking.status = 'REJECTED'
-                booking.remarks = 'Rejected: Auditorium already booked at this time.'
-                booking.save()
-                messages.error(request, f"Cannot approve: Auditorium is already booked during {booking.start_time} – {booking.end_time} on {booking.event_date}.")
-            else:
-                ev = Event.objects.filter(title=title, event_date=booking.event_date,
-                                          start_time=booking.start_time, end_time=booking.end_time,
-                                          venue='Auditorium').first()
-                if ev:
-                    ev.status = 'OPEN'
-                    ev.total_seats = getattr(settings, 'AUDITORIUM_CAPACITY', ev.total_seats or 500)
-                    ev.save()
-                else:
-                    Event.objects.create(title=title,
-                                         description=f"Approved auditorium booking by {booking.requested_by.username}",
-                                         department=booking.department,
-                                         event_date=booking.event_date,
-                                         start_time=booking.start_time,
-                                         end_time=booking.end_time,
-                                         venue='Auditorium',
-                                         total_seats=getattr(settings, 'AUDITORIUM_CAPACITY', 500),
-                                         status='OPEN',
-                                         created_by=booking.requested_by)
+            _approve_booking(request, booking)
 
         return redirect('booking_list_admin')
     return render(request, 'core/booking_form.html', {'booking': booking, 'admin_update': True})
@@ -427,7 +709,8 @@ def signup(request):
                     Profile.objects.create(user=user, role='organizer')
                 else:
                     Profile.objects.create(user=user, role='student')
-                login(request, user)
+                # several backends are configured, so name the one that loads the profile too
+                login(request, user, backend='core.auth.ProfileBackend')
                 messages.success(request, "Account created successfully.")
                 return redirect('home')
             except IntegrityError:
@@ -0,0 +1,73 @@
+"""Per-event waitlists for full events, served first come, first served.
+
+A student who finds an event full joins its waitlist instead of retrying
+registration. When a booked ticket is cancelled, `Ticket.cancel` calls
+`promote_next` in the same transaction: the head of the waitlist (one
+indexed read of ``waitlist_event_order_idx``) is booked into the released
+seat, so the seat counter, bitmap and status never change and no other
+user can take the place in between. The promoted student simply finds the
+ticket under My Activities. Only events that closed because they sold out
+(`Event.sold_out`) keep a waitlist moving; one an organizer closed by hand
+takes no new entries and promotes nobody.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Subquery
+from django.utils import timezone
+
+from .models import Event, Ticket, WaitlistEntry
+from .registration import AlreadyRegistered, EventFull, SeatsAvailable
+
+
+def join_waitlist(event_id, user):
+    """Put `user` at the back of the event's waitlist; returns their position.
+
+    Joining again keeps the current place. Raises `SeatsAvailable` if the
+    event is not full, `EventFull` if it is full but did not sell out (an
+    organizer closed it) and `AlreadyRegistered` if the user holds a ticket.
+    """
+    try:
+        with transaction.atomic():
+            # the INSERT takes the write lock before the checks below, so a
+            # concurrent cancellation either promotes this entry or has
+            # already released a seat that the capacity check sees
+            WaitlistEntry.objects.create(event_id=event_id, user=user)
+            if Event.objects.filter(pk=event_id, booked_count__lt=F('total_seats')).exists():
+                raise SeatsAvailable()
+            if not Event.objects.filter(pk=event_id, sold_out=True).exists():
+                raise EventFull()
+            if Ticket.objects.filter(event_id=event_id, user=user, status='BOOKED').exists():
+                raise AlreadyRegistered()
+    except IntegrityError:
+        pass  # already waiting
+    return waitlist_position(event_id, user)
+
+
+def leave_waitlist(event_id, user):
+    WaitlistEntry.objects.filter(event_id=event_id, user=user).delete()
+
+
+def waitlist_position(event_id, user):
+    """1-based place of `user` on the event's waitlist, or None if they are not on it."""
+    mine = WaitlistEntry.objects.filter(event_id=event_id, user=user).values('pk')
+    return WaitlistEntry.objects.filter(event_id=event_id, pk__lte=Subquery(mine)).count() or None
+
+
+def promote_next(event_id, seat=None):
+    """Book a released place, with `seat`, for the head of the event's waitlist.
+
+    Call inside the transaction that released it. Returns the promoted
+    user's id, or None when nobody is waiting or the event was closed by
+    hand rather than by selling out.
+    """
+    head = (WaitlistEntry.objects.filter(Q(event__status='OPEN') | Q(event__sold_out=True), event_id=event_id)
+            .order_by('pk').values_list('pk', 'user_id').first())
+    if head is None:
+        return None
+    entry_id, user_id = head
+    WaitlistEntry.objects.filter(pk=entry_id).delete()
+    # a ticket the user cancelled earlier is booked again in place (one per event and user),
+    # without the check-in of its previous booking
+    if not Ticket.objects.filter(event_id=event_id, user_id=user_id, status='CANCELLED').update(
+            status='BOOKED', seat=seat, booked_at=timezone.now(), checked_in_at=None):
+        Ticket.objects.create(event_id=event_id, user_id=user_id, seat=seat, status='BOOKED')
+    return user_id